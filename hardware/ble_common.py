@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Shared Hiwonder BLE connection helper for the BLE test scripts.
+Remembers the device address from the last scan so later runs can connect
+directly and skip the 10 second discovery scan.
+"""
+
+import json
+import os
+from bleak import BleakScanner, BleakClient
+
+# Hiwonder BLE Constants
+HIWONDER_DEVICE_NAME = "Hiwonder"
+HIWONDER_MAC = "8EE2E4F9-42E6-5BE3-4E2A-A706CAD38879"  # Tried when no address is cached yet
+BLE_CACHE_PATH = os.path.expanduser("~/.myogen_ble_cache.json")
+BLE_SCAN_TIMEOUT = 10  # Seconds to scan when there's no cached address or it fails
+BLE_DIRECT_CONNECT_TIMEOUT = 5  # Seconds to try the cached address before scanning
+
+def load_cached_address():
+    """Return the Hiwonder address saved by a previous scan, or None"""
+    try:
+        with open(BLE_CACHE_PATH) as f:
+            return json.load(f).get("mac")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def save_cached_address(address):
+    """Remember the Hiwonder address for the next run"""
+    try:
+        with open(BLE_CACHE_PATH, 'w') as f:
+            json.dump({"mac": address}, f)
+    except OSError as e:
+        print(f"⚠️ Could not save BLE address cache: {e}")
+
+def is_hiwonder(device):
+    """True if a scanned device is the Hiwonder board (by name or known address)"""
+    return (device.name == HIWONDER_DEVICE_NAME or 
+            device.address == HIWONDER_MAC or 
+            bool(device.name and "hiwonder" in device.name.lower()))
+
+async def _disconnect_quietly(client):
+    """Drop a half-open connection attempt, ignoring errors"""
+    try:
+        await client.disconnect()
+    except Exception:
+        pass
+
+async def scan_for_hiwonder():
+    """Scan for Hiwonder BLE device"""
+    print("🔍 Scanning for Hiwonder BLE device...")
+    
+    devices = await BleakScanner.discover(timeout=BLE_SCAN_TIMEOUT)
+    
+    for device in devices:
+        if is_hiwonder(device):
+            print(f"✓ Found Hiwonder device: {device.address}")
+            return device
+    
+    print("❌ Hiwonder device not found!")
+    return None
+
+async def get_hiwonder_client(**client_kwargs):
+    """Return a connected BleakClient for the Hiwonder device (kwargs go to BleakClient), or None"""
+    # A direct connect to the cached (or known) address takes well under a second; only scan if it fails
+    address = load_cached_address() or HIWONDER_MAC
+    print(f"🔗 Connecting to {address}...")
+    client = BleakClient(address, timeout=BLE_DIRECT_CONNECT_TIMEOUT, **client_kwargs)
+    try:
+        await client.connect()
+        if client.is_connected:
+            return client
+    except Exception as e:
+        print(f"⚠️ Direct connect failed ({e}), scanning instead")
+    await _disconnect_quietly(client)
+    
+    device = await scan_for_hiwonder()
+    if not device:
+        return None
+    save_cached_address(device.address)
+    
+    print(f"\n🔗 Connecting to {device.address}...")
+    client = BleakClient(device, **client_kwargs)
+    try:
+        await client.connect()
+    except Exception as e:
+        print(f"❌ Connection error: {e}")
+    if client.is_connected:
+        return client
+    await _disconnect_quietly(client)
+    return None
@@ -424,6 +424,87 @@ async def send_pose(pose_name: str, angles: List[int]) -> bool:
         is_ble_connected = False
         return False
 
+class PoseWriter:
+    """Streams poses to the hand from one writer task, keeping only the newest unsent pose"""
+    
+    def __init__(self, client, write_char, build_packet=build_hiwonder_servo_packet, time_ms: int = 1000):
+        self.client = client
+        self.write_char = write_char
+        self.build_packet = build_packet
+        self.time_ms = time_ms
+        self.q = asyncio.Queue(maxsize=1)
+        self.task = None
+    
+    def start(self) -> "PoseWriter":
+        """Start the writer task on the running event loop"""
+        self.task = asyncio.create_task(self.run())
+        return self
+    
+    def submit(self, angles: List[int]):
+        """Queue a pose without waiting; replaces a queued pose that hasn't been written yet"""
+        try:
+            self.q.get_nowait()
+            self.q.task_done()
+        except asyncio.QueueEmpty:
+            pass
+        self.q.put_nowait(list(angles))
+    
+    async def run(self):
+        """Write each queued pose as soon as the previous write is done"""
+        while True:
+            angles = await self.q.get()
+            try:
+                packet = self.build_packet(angles, time_ms=self.time_ms)
+                await self.client.write_gatt_char(self.write_char, packet, response=False)
+            except Exception as e:
+                print(f"❌ BLE write failed: {e}")
+            finally:
+                self.q.task_done()
+    
+    async def close(self):
+        """Write any queued pose, then stop the writer task"""
+        if self.task is None:
+            return
+        await self.q.join()
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
+
+class PoseSender:
+    """Keeps one BLE connection open for another script, which sends poses in-process"""
+    
+    def __init__(self):
+        self.writer = None
+    
+    @property
+    def is_connected(self) -> bool:
+        return self.writer is not None and is_ble_connected
+    
+    async def connect(self) -> bool:
+        """Scan for and connect to the hand, then start the pose writer"""
+        if not await connect_to_hiwonder_ble():
+            return False
+        self.writer = PoseWriter(ble_client, ble_write_char).start()
+        return True
+    
+    async def send(self, angles: List[int]) -> bool:
+        """Queue servo angles for the writer; a newer pose replaces them if they haven't gone out yet"""
+        if not self.is_connected:
+            print("❌ Not connected to BLE device")
+            return False
+        self.writer.submit(angles)
+        return True
+    
+    async def close(self):
+        """Flush the last pose, return to neutral and disconnect"""
+        if self.writer:
+            await self.writer.close()
+            self.writer = None
+        await cleanup()
+
 def print_available_poses():
     """Print all available poses"""
     print("\n📋 Available Hand Poses:")
@@ -158,8 +158,10 @@ class HandTracker:
     def run(self):
         """Run hand tracking with visualization"""
         cap = cv2.VideoCapture(0)
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
         cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
         cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Only the newest frame, no queued backlog
         
         print("Hand Tracking Started")
         print("Press 'q' to quit")
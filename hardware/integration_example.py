@@ -45,54 +45,60 @@ async def main_integration_loop():
     object_detector = ObjectDetectionSimulator()
     
     frame_count = 0
+    sent_version = llm_sender.angles_version
     
-    while True:
-        try:
-            # Simulate new object detection frame every 2 seconds
-            await asyncio.sleep(2)
-            frame_count += 1
-            
-            # Get new object (simulates computer vision detection)
-            new_object = object_detector.get_next_object()
-            if new_object:
-                obj_id, size, position, orientation = new_object
-                print(f"\n📸 Frame {frame_count}: Detected {obj_id}")
+    try:
+        while True:
+            try:
+                # Simulate new object detection frame every 2 seconds
+                await asyncio.sleep(2)
+                frame_count += 1
                 
-                # Add to LLM processing queue
-                llm_sender.add_object(obj_id, size, position, orientation)
-            
-            # Try to process next object in queue (non-blocking)
-            processed = await llm_sender.process_next_object()
-            
-            if processed and llm_sender.latest_servo_angles:
-                # Send to robotic hand
-                servo_angles = llm_sender.latest_servo_angles
+                # Get new object (simulates computer vision detection)
+                new_object = object_detector.get_next_object()
+                if new_object:
+                    obj_id, size, position, orientation = new_object
+                    print(f"\n📸 Frame {frame_count}: Detected {obj_id}")
+                    
+                    # Add to LLM processing queue
+                    llm_sender.add_object(obj_id, size, position, orientation)
                 
-                print(f"🚀 Sending to hand: {servo_angles}")
+                # Try to process next object in queue (non-blocking)
+                await llm_sender.process_next_object()
                 
-                # Method 1: Direct command (uncomment to actually send)
-                # cmd = ['python3', 'ble_pose_sender.py', '--angles'] + [str(x) for x in servo_angles]
-                # subprocess.run(cmd)
+                # New angles come from a processed object or a pose cache hit
+                if llm_sender.angles_version != sent_version and llm_sender.latest_servo_angles:
+                    sent_version = llm_sender.angles_version
+                    # Send to robotic hand
+                    servo_angles = llm_sender.latest_servo_angles
+                    
+                    print(f"🚀 Sending to hand: {servo_angles}")
+                    
+                    # Method 1: Direct command (uncomment to actually send)
+                    # cmd = ['python3', 'ble_pose_sender.py', '--angles'] + [str(x) for x in servo_angles]
+                    # subprocess.run(cmd)
+                    
+                    # Method 2: Store in BLE pose sender's LLM mode (preferred)
+                    print(f"💾 Ready for BLE sender: {','.join(map(str, servo_angles))}")
+                    print("   Use: python3 ble_pose_sender.py --llm")
+                    print("   Press 's' and enter the angles above")
+                    print("   Press Enter to send to hand!")
                 
-                # Method 2: Store in BLE pose sender's LLM mode (preferred)
-                print(f"💾 Ready for BLE sender: {','.join(map(str, servo_angles))}")
-                print("   Use: python3 ble_pose_sender.py --llm")
-                print("   Press 's' and enter the angles above")
-                print("   Press Enter to send to hand!")
-            
-            # Show status
-            status = llm_sender.get_status()
-            if status['queue_size'] > 0 or status['is_processing']:
-                print(f"📊 Queue: {status['queue_size']}, Processing: {status['is_processing']}")
-            
-            # Stop after processing all objects
-            if not new_object and status['queue_size'] == 0 and not status['is_processing']:
-                print("\n✅ All objects processed!")
-                break
+                # Show status
+                status = llm_sender.get_status()
+                if status['queue_size'] > 0 or status['is_processing']:
+                    print(f"📊 Queue: {status['queue_size']}, Processing: {status['is_processing']}")
                 
-        except KeyboardInterrupt:
-            print("\n👋 Stopping integration...")
-            break
+                # Stop after processing all objects
+                if not new_object and status['queue_size'] == 0 and not status['is_processing']:
+                    print("\n✅ All objects processed!")
+                    break
+                    
+            except KeyboardInterrupt:
+                print("\n👋 Stopping integration...")
+                break
+    finally:
+        await llm_sender.aclose()
 
 def quick_test():
     """Quick test of the integration"""
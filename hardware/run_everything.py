@@ -5,7 +5,6 @@ This coordinates object detection, LLM processing, and BLE pose sending.
 """
 
 import asyncio
-import subprocess
 import json
 import re
 import time
@@ -13,14 +12,57 @@ import sys
 import os
 from pathlib import Path
 
+LLM_API_URL = "https://6kazu8ogvih4cs-8080.proxy.runpod.net/generate"
+
+# Concurrent LLM requests and how many objects may wait for a worker
+LLM_WORKERS = 2
+LLM_QUEUE_SIZE = 4
+
+# Finger curl pattern, compiled once and matched case-insensitively
+_FINGER_RE = re.compile(r'(pinky|ring|middle|index|thumb):\s*(no curl|half curl|full curl)', re.IGNORECASE)
+
+# Slot of each finger in the numeric array and numeric code of each curl
+_FINGER_IDS = {'pinky': 0, 'ring': 1, 'middle': 2, 'index': 3, 'thumb': 4}
+_CURL_IDS = {'full curl': 0, 'half curl': 1, 'no curl': 2}
+
+def _parse_curls_fast(text):
+    """Parse a well-formed 'pinky: ...; ring: ...' line without the regex.
+    
+    Returns the numeric curl array, or None if the text is not in the
+    expected shape and the regex parser should be used instead.
+    """
+    if text[:6].lower() != 'pinky:':
+        return None
+    numeric_array = [1, 1, 1, 1, 1]
+    try:
+        for part in text.split(';', 4):
+            finger, curl = part.split(':', 1)
+            numeric_array[_FINGER_IDS[finger.strip().lower()]] = _CURL_IDS[curl.strip().lower()]
+    except (KeyError, ValueError):
+        return None
+    return numeric_array
+
 class MasterController:
-    def __init__(self):
+    def __init__(self, use_cache=False):
         self.latest_servo_angles = None
-        self.is_processing = False
+        # LLM worker pool feeding a single BLE writer (started lazily)
+        self._llm_queue = None
+        self._ble_queue = None
+        self._workers = []
         self.ble_process = None
+        self.ble_available = None
+        # Optional memoization of LLM responses and parsed angles (--cache)
+        self.use_cache = use_cache
+        self._cache = {}
+        self._angle_cache = {}
         
     async def get_llm_prediction(self, object_identity, object_size, object_position, object_orientation):
         """Get LLM prediction for object"""
+        key = (object_identity, object_size, object_position, object_orientation)
+        if self.use_cache and key in self._cache:
+            print(f"💾 Cached LLM prediction for: {object_identity}")
+            return self._cache[key]
+        
         prompt = f"""Scene: A single everyday object is visible.
 Object identity: {object_identity}.
 Object size: {object_size}. Object position: {object_position}. Object orientation: {object_orientation}.
@@ -39,26 +81,28 @@ Do not add any extra words."""
             "stop": ["\n"]
         }
         
-        curl_script = f'''curl -sS -X POST "https://6kazu8ogvih4cs-8080.proxy.runpod.net/generate" \\
-  -H "Content-Type: application/json" \\
-  --data-binary @- << 'JSON'
-{json.dumps(json_data, indent=2)}
-JSON'''
+        body = json.dumps(json_data, separators=(',', ':')).encode()
         
         print(f"🌐 Getting LLM prediction for: {object_identity}")
         
         try:
-            process = await asyncio.create_subprocess_shell(
-                curl_script,
+            # Run curl directly (no shell) and stream the JSON body on stdin
+            process = await asyncio.create_subprocess_exec(
+                'curl', '-sS', '-X', 'POST', LLM_API_URL,
+                '-H', 'Content-Type: application/json',
+                '--data-binary', '@-',
+                stdin=asyncio.subprocess.PIPE,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE
             )
             
-            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=30)
+            stdout, stderr = await asyncio.wait_for(process.communicate(body), timeout=30)
             
             if process.returncode == 0:
                 response = stdout.decode().strip()
                 print(f"✅ LLM Response: {response[:100]}...")
+                if self.use_cache:
+                    self._cache[key] = response
                 return response
             else:
                 print(f"❌ LLM API Error: {stderr.decode()}")
@@ -73,7 +117,9 @@ JSON'''
     
     def parse_to_servo_angles(self, response):
         """Parse LLM response to servo angles"""
-        curl_to_numeric = {'full curl': 0, 'half curl': 1, 'no curl': 2}
+        if self.use_cache and response in self._angle_cache:
+            return list(self._angle_cache[response])
+        
         default_array = [1, 1, 1, 1, 1]
         
         try:
@@ -84,15 +130,19 @@ JSON'''
             else:
                 text = response or ""
             
-            # Parse finger curls
-            finger_pattern = r'(pinky|ring|middle|index|thumb):\s*(no curl|half curl|full curl)'
-            matches = re.findall(finger_pattern, text.lower())
+            # Fast path for responses that follow the requested format exactly
+            text = text.strip()
+            numeric_array = _parse_curls_fast(text)
+            matched = numeric_array is not None
+            
+            if not matched:
+                # Parse finger curls straight into their slots (missing fingers stay half curl)
+                numeric_array = [1, 1, 1, 1, 1]
+                for finger, curl in _FINGER_RE.findall(text):
+                    numeric_array[_FINGER_IDS[finger.lower()]] = _CURL_IDS[curl.lower()]
+                    matched = True
             
-            if matches:
-                finger_curls = {finger: curl for finger, curl in matches}
-                finger_order = ['pinky', 'ring', 'middle', 'index', 'thumb']
-                numeric_array = [curl_to_numeric.get(finger_curls.get(finger, 'half curl'), 1) 
-                               for finger in finger_order]
+            if matched:
                 print(f"🔄 Parsed curls: {numeric_array} [pinky, ring, middle, index, thumb]")
             else:
                 numeric_array = default_array
@@ -100,6 +150,8 @@ JSON'''
             
             # Convert to servo angles
             servo_angles = self.numeric_to_servo_angles(numeric_array)
+            if self.use_cache:
+                self._angle_cache[response] = tuple(servo_angles)
             return servo_angles
             
         except Exception as e:
@@ -136,16 +188,26 @@ JSON'''
         ]
     
     async def send_to_ble_pose_sender(self, servo_angles):
-        """Send servo angles to BLE pose sender"""
+        """Send servo angles to BLE pose sender.
+
+        ble_pose_sender.py already packs all six angles into one Hiwonder
+        packet sent as a single write-without-response.
+        """
         try:
             print(f"🤖 Sending to robotic hand: {servo_angles}")
             cmd = ['python3', 'ble_pose_sender.py', '--angles'] + [str(x) for x in servo_angles]
             
-            # Check if BLE dependencies are available
+            # Check if BLE dependencies are available (probed once per controller)
             try:
-                result = subprocess.run(['python3', '-c', 'import bleak'], 
-                                      capture_output=True, timeout=5)
-                if result.returncode == 0:
+                if self.ble_available is None:
+                    result = await asyncio.create_subprocess_exec(
+                        'python3', '-c', 'import bleak',
+                        stdout=asyncio.subprocess.DEVNULL,
+                        stderr=asyncio.subprocess.DEVNULL
+                    )
+                    self.ble_available = await asyncio.wait_for(result.wait(), timeout=5) == 0
+                
+                if self.ble_available:
                     # BLE available, send directly
                     print(f"📤 Executing: {' '.join(cmd)}")
                     process = await asyncio.create_subprocess_exec(*cmd)
@@ -161,45 +223,102 @@ JSON'''
         except Exception as e:
             print(f"❌ Send error: {e}")
     
-    async def process_object(self, object_identity, object_size, object_position, object_orientation):
-        """Process a single object through the complete pipeline"""
-        if self.is_processing:
-            print("⚠️ Already processing, skipping...")
-            return False
+    def _start_workers(self):
+        """Start the LLM worker pool and the single BLE writer on first use"""
+        if self._workers:
+            return
+        self._llm_queue = asyncio.Queue(maxsize=LLM_QUEUE_SIZE)
+        self._ble_queue = asyncio.Queue()
+        self._workers = [asyncio.create_task(self._llm_worker()) for _ in range(LLM_WORKERS)]
+        self._workers.append(asyncio.create_task(self._ble_writer()))
+    
+    async def _llm_worker(self):
+        """Fetch and parse LLM predictions; several of these run concurrently"""
+        while True:
+            description, angles_future = await self._llm_queue.get()
+            try:
+                # Step 1: Get LLM prediction
+                response = await self.get_llm_prediction(*description)
+                
+                if not response:
+                    print("❌ No LLM response, using default pose")
+                    servo_angles = [90, 90, 90, 100, 90, 90]  # Default neutral
+                else:
+                    # Step 2: Parse to servo angles
+                    servo_angles = self.parse_to_servo_angles(response)
+                
+                angles_future.set_result(servo_angles)
+            except Exception as e:
+                print(f"❌ Pipeline error: {e}")
+                if not angles_future.done():
+                    angles_future.set_result(None)
+            finally:
+                self._llm_queue.task_done()
+    
+    async def _ble_writer(self):
+        """Send poses to the robotic hand one at a time, in the order objects were submitted"""
+        while True:
+            angles_future, future = await self._ble_queue.get()
+            try:
+                # Waits for this object's prediction even if a later one finished first
+                servo_angles = await angles_future
+                if servo_angles is None:
+                    future.set_result(False)
+                    continue
+                
+                # Step 3: Send to robotic hand
+                self.latest_servo_angles = servo_angles
+                print(f"🎯 Final servo angles: {servo_angles}")
+                print(f"   [thumb={servo_angles[0]}°, index={servo_angles[1]}°, middle={servo_angles[2]}°, ring={servo_angles[3]}°, pinky={servo_angles[4]}°, wrist={servo_angles[5]}°]")
+                
+                await self.send_to_ble_pose_sender(servo_angles)
+                if not future.done():
+                    future.set_result(True)
+            except Exception as e:
+                print(f"❌ Pipeline error: {e}")
+                if not future.done():
+                    future.set_result(False)
+            finally:
+                self._ble_queue.task_done()
+    
+    async def submit_object(self, object_identity, object_size, object_position, object_orientation):
+        """Queue an object for the pipeline and return a future for its result.
+
+        Submitted objects are predicted concurrently by the LLM workers,
+        while their poses are sent to the hand one at a time in submission
+        order. The future resolves to True once the pose was sent.
+        """
+        self._start_workers()
         
-        self.is_processing = True
+        print(f"\n🎯 Processing Object: {object_identity}")
+        print(f"   Size: {object_size}")
+        print(f"   Position: {object_position}")
+        print(f"   Orientation: {object_orientation}")
         
-        try:
-            print(f"\n🎯 Processing Object: {object_identity}")
-            print(f"   Size: {object_size}")
-            print(f"   Position: {object_position}")
-            print(f"   Orientation: {object_orientation}")
-            
-            # Step 1: Get LLM prediction
-            response = await self.get_llm_prediction(object_identity, object_size, object_position, object_orientation)
-            
-            if not response:
-                print("❌ No LLM response, using default pose")
-                servo_angles = [90, 90, 90, 100, 90, 90]  # Default neutral
-            else:
-                # Step 2: Parse to servo angles
-                servo_angles = self.parse_to_servo_angles(response)
-            
-            # Step 3: Send to robotic hand
-            self.latest_servo_angles = servo_angles
-            print(f"🎯 Final servo angles: {servo_angles}")
-            print(f"   [thumb={servo_angles[0]}°, index={servo_angles[1]}°, middle={servo_angles[2]}°, ring={servo_angles[3]}°, pinky={servo_angles[4]}°, wrist={servo_angles[5]}°]")
-            
-            await self.send_to_ble_pose_sender(servo_angles)
-            
-            return True
-            
-        finally:
-            self.is_processing = False
+        loop = asyncio.get_running_loop()
+        angles_future = loop.create_future()
+        future = loop.create_future()
+        description = (object_identity, object_size, object_position, object_orientation)
+        await self._llm_queue.put((description, angles_future))
+        # No await between the two puts, so both queues see objects in the same order
+        self._ble_queue.put_nowait((angles_future, future))
+        return future
+    
+    async def process_object(self, object_identity, object_size, object_position, object_orientation):
+        """Process a single object through the complete pipeline"""
+        future = await self.submit_object(object_identity, object_size, object_position, object_orientation)
+        return await future
+    
+    async def close(self):
+        """Stop the LLM workers and the BLE writer"""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
 
-async def demo_mode():
+async def demo_mode(use_cache=False):
     """Run demo with sample objects"""
-    controller = MasterController()
+    controller = MasterController(use_cache)
     
     print("🚀 Running Complete LLM → Robotic Hand Pipeline")
     print("=" * 60)
@@ -211,21 +330,22 @@ async def demo_mode():
         ("025_mug", "medium", "close, right side, table level relative to the camera", "upright, handle facing left"),
     ]
     
-    for i, (obj_id, size, position, orientation) in enumerate(objects, 1):
-        print(f"\n📸 Processing Object {i}/{len(objects)}")
-        print("=" * 40)
-        
-        success = await controller.process_object(obj_id, size, position, orientation)
-        
-        if success:
-            print("✅ Object processed successfully!")
-        else:
-            print("❌ Object processing failed")
+    try:
+        # Submit everything up front so the LLM workers overlap the predictions
+        futures = []
+        for i, (obj_id, size, position, orientation) in enumerate(objects, 1):
+            print(f"\n📸 Processing Object {i}/{len(objects)}")
+            print("=" * 40)
+            futures.append(await controller.submit_object(obj_id, size, position, orientation))
         
-        # Wait between objects
-        if i < len(objects):
-            print("\n⏳ Waiting 3 seconds before next object...")
-            await asyncio.sleep(3)
+        # Poses are sent in submission order, so results come back in that order too
+        for i, future in enumerate(futures, 1):
+            if await future:
+                print(f"✅ Object {i} processed successfully!")
+            else:
+                print(f"❌ Object {i} processing failed")
+    finally:
+        await controller.close()
     
     print("\n🎉 Demo completed!")
     print("=" * 60)
@@ -238,9 +358,9 @@ async def demo_mode():
         print(f"   python3 ble_pose_sender.py --llm")
         print(f"   (then press 's' and enter: {','.join(map(str, angles))})")
 
-async def interactive_mode():
+async def interactive_mode(use_cache=False):
     """Interactive mode for custom objects"""
-    controller = MasterController()
+    controller = MasterController(use_cache)
     
     print("🎮 Interactive Mode")
     print("=" * 40)
@@ -248,54 +368,63 @@ async def interactive_mode():
     print("Type 'quit' to exit.")
     print()
     
-    while True:
-        try:
-            print("📝 Enter object details:")
-            obj_id = input("  Object ID (e.g., '080_keyboard'): ").strip()
-            if obj_id.lower() == 'quit':
+    try:
+        while True:
+            try:
+                print("📝 Enter object details:")
+                obj_id = input("  Object ID (e.g., '080_keyboard'): ").strip()
+                if obj_id.lower() == 'quit':
+                    break
+                
+                size = input("  Size (small/medium/large): ").strip() or "medium"
+                position = input("  Position: ").strip() or "arm's-length, centered"
+                orientation = input("  Orientation: ").strip() or "upright"
+                
+                print("\n🔄 Processing...")
+                success = await controller.process_object(obj_id, size, position, orientation)
+                
+                if success:
+                    print("✅ Processing complete!")
+                else:
+                    print("❌ Processing failed")
+                
+                print("\n" + "="*40)
+                
+            except KeyboardInterrupt:
+                print("\n👋 Exiting...")
                 break
-            
-            size = input("  Size (small/medium/large): ").strip() or "medium"
-            position = input("  Position: ").strip() or "arm's-length, centered"
-            orientation = input("  Orientation: ").strip() or "upright"
-            
-            print("\n🔄 Processing...")
-            success = await controller.process_object(obj_id, size, position, orientation)
-            
-            if success:
-                print("✅ Processing complete!")
-            else:
-                print("❌ Processing failed")
-            
-            print("\n" + "="*40)
-            
-        except KeyboardInterrupt:
-            print("\n👋 Exiting...")
-            break
-        except EOFError:
-            print("\n👋 Exiting...")
-            break
+            except EOFError:
+                print("\n👋 Exiting...")
+                break
+    finally:
+        await controller.close()
 
 def main():
     """Main function"""
     print("🤖 Master LLM → Robotic Hand Controller")
     print("=" * 50)
     
-    if len(sys.argv) > 1:
-        if sys.argv[1] == "--demo":
-            asyncio.run(demo_mode())
-        elif sys.argv[1] == "--interactive":
-            asyncio.run(interactive_mode())
-        elif sys.argv[1] == "--keyboard":
+    use_cache = "--cache" in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if arg != "--cache"]
+    
+    if args:
+        if args[0] == "--demo":
+            asyncio.run(demo_mode(use_cache))
+        elif args[0] == "--interactive":
+            asyncio.run(interactive_mode(use_cache))
+        elif args[0] == "--keyboard":
             # Quick test with keyboard object
             async def quick_test():
-                controller = MasterController()
-                await controller.process_object(
-                    "080_keyboard",
-                    "medium",
-                    "several feet away, left, bottom relative to the camera",
-                    "significantly rotated counterclockwise around the x-axis"
-                )
+                controller = MasterController(use_cache)
+                try:
+                    await controller.process_object(
+                        "080_keyboard",
+                        "medium",
+                        "several feet away, left, bottom relative to the camera",
+                        "significantly rotated counterclockwise around the x-axis"
+                    )
+                finally:
+                    await controller.close()
             asyncio.run(quick_test())
         else:
             print("❌ Unknown option. Use --demo, --interactive, or --keyboard")
@@ -304,6 +433,7 @@ def main():
         print("  --demo        : Run with sample objects")
         print("  --interactive : Enter custom objects")
         print("  --keyboard    : Quick test with keyboard object")
+        print("  --cache       : Reuse LLM responses for repeated objects")
         print()
         print("Example:")
         print("  python3 run_everything.py --demo")
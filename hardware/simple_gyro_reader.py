@@ -20,33 +20,38 @@ FRAME_HEADER = 0x55
 CMD_START_GYRO_STREAM = 0x11
 CMD_STOP_GYRO_STREAM = 0x12
 
+# Prebuilt command packets: header, header, length (just command), command
+_PACKETS = {
+    CMD_START_GYRO_STREAM: bytes((FRAME_HEADER, FRAME_HEADER, 1, CMD_START_GYRO_STREAM)),
+    CMD_STOP_GYRO_STREAM: bytes((FRAME_HEADER, FRAME_HEADER, 1, CMD_STOP_GYRO_STREAM)),
+}
+
 # Global connection variables
 ble_client = None
 is_connected = False
 
-async def connect_to_arduino():
-    """Connect to Arduino BLE device"""
+async def connect_to_arduino(on_disconnect=None):
+    """Connect to Arduino BLE device; on_disconnect(client) is called if the link drops"""
     global ble_client, is_connected
     
     print("🔍 Scanning for Hiwonder BLE device...")
-    devices = await BleakScanner.discover(timeout=10.0)
-    
-    target_device = None
-    for device in devices:
-        if (device.name == HIWONDER_DEVICE_NAME or 
-            device.address == HIWONDER_MAC or 
-            (device.name and "hiwonder" in device.name.lower())):
-            print(f"🎯 Found device: {device.name} ({device.address})")
-            target_device = device
-            break
+    # Stop scanning as soon as the first matching advertisement arrives
+    target_device = await BleakScanner.find_device_by_filter(
+        lambda device, adv: (device.name == HIWONDER_DEVICE_NAME or 
+                             device.address == HIWONDER_MAC or 
+                             (device.name and "hiwonder" in device.name.lower())),
+        timeout=10.0
+    )
     
     if not target_device:
         print("❌ Hiwonder device not found")
         return False
     
+    print(f"🎯 Found device: {target_device.name} ({target_device.address})")
+    
     try:
         print(f"📞 Connecting to {target_device.name}...")
-        ble_client = BleakClient(target_device)
+        ble_client = BleakClient(target_device, disconnected_callback=on_disconnect)
         await ble_client.connect()
         
         if ble_client.is_connected:
@@ -67,13 +72,8 @@ async def send_gyro_command(command: int):
         return False
         
     try:
-        # Build simple command packet
-        packet = bytearray([
-            FRAME_HEADER,  # 0x55
-            FRAME_HEADER,  # 0x55
-            1,             # Length (just command)
-            command        # Command
-        ])
+        # Look up the prebuilt command packet
+        packet = _PACKETS[command]
         
         # Find the correct write characteristic (handle 24 in service 0000fff0)
         write_char = None
@@ -129,14 +129,30 @@ def print_gyro_data(data):
           f"Accel: ({data['accel_x']:6d}, {data['accel_y']:6d}, {data['accel_z']:6d}) "
           f"Mag: G={gyro_mag:7.1f} A={accel_mag:7.1f} T={data['timestamp']}")
 
+async def _heartbeat(stop_event: asyncio.Event):
+    """Print a monitoring status line every 10 seconds until stopped"""
+    start_time = time.time()
+    while not stop_event.is_set():
+        await asyncio.sleep(10)
+        print(f"⏱️  Still monitoring... ({int(time.time() - start_time)}s elapsed)")
+        print("💡 Check Arduino Serial Monitor for gyro data output")
+
 async def main():
     """Main function"""
     global ble_client, is_connected
     
     print("🚀 Simple Gyro Reader Starting...")
     
+    stop_event = asyncio.Event()  # Set when the BLE link drops
+    heartbeat_task = None
+    
+    def on_disconnect(client):
+        if not stop_event.is_set():
+            print("\n📶 Arduino disconnected")
+        stop_event.set()
+    
     # Connect to Arduino
-    if not await connect_to_arduino():
+    if not await connect_to_arduino(on_disconnect):
         return
     
     try:
@@ -154,21 +170,17 @@ async def main():
         print("💡 You should see lines like: GYRO:gx,gy,gz,ax,ay,az,timestamp")
         print("Press Ctrl+C to stop")
         
-        # Keep connection alive and show status
-        start_time = time.time()
-        while True:
-            await asyncio.sleep(1)
-            
-            # Print status every 10 seconds
-            if time.time() - start_time > 10:
-                print(f"⏱️  Still monitoring... ({int(time.time() - start_time)}s elapsed)")
-                print("💡 Check Arduino Serial Monitor for gyro data output")
-                start_time = time.time()
+        # Keep connection alive until it drops or Ctrl+C; a single task prints status every 10 seconds
+        heartbeat_task = asyncio.create_task(_heartbeat(stop_event))
+        await stop_event.wait()
     
     except KeyboardInterrupt:
         print("\n👋 Stopping gyro monitoring...")
     
     finally:
+        stop_event.set()
+        if heartbeat_task:
+            heartbeat_task.cancel()
         if is_connected:
             try:
                 print("📡 Stopping gyro stream...")
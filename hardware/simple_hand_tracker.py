@@ -10,14 +10,22 @@ import mediapipe as mp
 import numpy as np
 import serial
 import serial.tools.list_ports
+import os
+import re
 import struct
+import sys
 import time
 import asyncio
+import math
+import queue
+import threading
+from functools import lru_cache
 from typing import List, Tuple, Optional
 
 # Screen capture support using Quartz (macOS native)
 try:
     import Quartz
+    import objc
     import tkinter as tk
     from tkinter import messagebox
     SCREEN_CAPTURE_AVAILABLE = True
@@ -33,6 +41,13 @@ except ImportError:
         SCREEN_CAPTURE_AVAILABLE = False
         QUARTZ_AVAILABLE = False
 
+# App activation notifications (macOS) for refreshing tracked window bounds on demand
+try:
+    from AppKit import NSWorkspace, NSWorkspaceDidActivateApplicationNotification
+    APPKIT_AVAILABLE = True
+except ImportError:
+    APPKIT_AVAILABLE = False
+
 # Window capture support (cross-platform)
 try:
     import subprocess
@@ -50,6 +65,33 @@ except ImportError:
         WINDOW_CAPTURE_AVAILABLE = False
         PYGETWINDOW_AVAILABLE = False
 
+# Optional JIT compilation for the per-frame landmark math
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when numba is not installed"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# OpenCL (OpenCV T-API) offload for webcam mirroring and colour conversion
+OPENCL_AVAILABLE = cv2.ocl.haveOpenCL()
+if OPENCL_AVAILABLE:
+    cv2.ocl.setUseOpenCL(True)
+
+# Terminal keyboard input for --no-preview runs (POSIX terminals only)
+try:
+    import select
+    import termios
+    import tty
+    TERMINAL_KEYS_AVAILABLE = True
+except ImportError:
+    TERMINAL_KEYS_AVAILABLE = False
+
 # BLE support
 try:
     from bleak import BleakClient, BleakScanner
@@ -65,18 +107,40 @@ CMD_SERVO_MOVE = 0x03
 serial_connection = None
 ble_client = None
 ble_write_char = None
+ble_write_response = False  # Only wait for write ACKs if the characteristic lacks write-without-response
 is_ble_connected = False
-servo_angles = [90, 90, 90, 90, 90, 90]  # Current servo angles (sent to Arduino)
-target_angles = [90, 90, 90, 90, 90, 90]  # Target angles (from hand detection)
-smoothed_angles = [90.0, 90.0, 90.0, 90.0, 90.0, 90.0]  # Smoothed angles (float for precision)
+# Servo state as one contiguous (3, 6) block; the names below are row views into it
+SERVO_CUR, SERVO_TGT, SERVO_SM = 0, 1, 2
+servo_state = np.full((3, 6), 90.0, np.float32)
+servo_angles = servo_state[SERVO_CUR]  # Current servo angles (sent to Arduino, whole degrees)
+target_angles = servo_state[SERVO_TGT]  # Target angles (from hand detection)
+smoothed_angles = servo_state[SERVO_SM]  # Smoothed angles (float for precision)
+OPEN_HAND_ANGLES = np.array([0, 0, 0, 25, 0, 90], dtype=np.float32)  # 'o' key preset
+FIST_ANGLES = np.array([180, 180, 180, 180, 180, 90], dtype=np.float32)  # 'f' key preset
 last_update_time = 0
 update_interval = 0.02  # Update servos every 20ms (50Hz)
 
+# Servo I/O runs on a background asyncio loop so writes never block the capture loop
+io_loop = None  # Event loop running on the servo I/O thread
+io_thread = None
+latest_target = np.full(6, 90.0, dtype=np.float32)  # Newest angles waiting to be sent
+latest_target_lock = threading.Lock()
+servo_update_event = None  # asyncio.Event set when latest_target holds unsent angles
+packet_writer_task = None
+
 # Screen capture variables
 screen_capture_region = None  # (x, y, width, height) for screen capture
 use_screen_capture = False
-sct = None
+sct_local = threading.local()  # Per-thread mss instance (mss is not thread-safe)
 tracked_window_info = None  # Store window info for real-time tracking
+_window_list_cache = (0.0, None)  # (monotonic timestamp, window list) from the last Quartz scan
+WINDOW_LIST_CACHE_TTL = 0.5  # Seconds a Quartz window scan is reused
+INFERENCE_MAX_DIM = 640  # Longest side of captured frames fed to MediaPipe
+bounds_dirty = True  # Set when the tracked window may have moved; cleared by a bounds refresh
+workspace_observer = None  # NSWorkspace activation observer token
+BOUNDS_POLL_INTERVAL = 30  # Frames between bounds polls when no activation notifications arrive
+BOUNDS_REFRESH_INTERVAL = 300  # Slower fallback poll once activation notifications are being delivered
+bounds_refresh_interval = BOUNDS_POLL_INTERVAL  # Raised by watch_window_activation
 
 # Hiwonder BLE device constants (from our scan)
 HIWONDER_DEVICE_NAME = "Hiwonder"
@@ -84,21 +148,150 @@ HIWONDER_MAC = "8EE2E4F9-42E6-5BE3-4E2A-A706CAD38879"
 HIWONDER_SERVICE_UUID = "0000fff0-0000-1000-8000-00805f9b34fb"
 HIWONDER_WRITE_CHAR_UUID = "0000ffe1-0000-1000-8000-00805f9b34fb"
 
+# Adaptive frame skipping: while tracking is confident, MediaPipe only runs every (1 + skip) frames
+frame_skip_confident = 2  # Frames skipped between inferences at high confidence
+frame_skip_confidence = 0.9  # Hand score needed to start skipping frames
+preview_interval = 1 / 15  # Seconds between preview window refreshes (tracking runs faster)
+fps_report_interval = 1.0  # Seconds between FPS printouts when running without a preview window
+
+# Once a hand is found, MediaPipe only sees a padded crop around it
+INFERENCE_ROI_PADDING = 40  # Pixels of margin around the hand bounding box
+INFERENCE_ROI_MIN_SIZE = 256  # Smallest square crop fed to MediaPipe
+INFERENCE_ROI_MAX_MISSES = 5  # Results without a hand before falling back to the full frame
+
+# Screen capture often returns the same pixels twice; such frames skip MediaPipe
+STATIC_FRAME_THUMB_SIZE = (32, 32)  # Thumbnail compared between frames
+STATIC_FRAME_L1_THRESHOLD = 32 * 32 * 3 // 2  # Below this (~0.5 level per pixel) frames count as unchanged
+
 # Smoothing parameters
 smoothing_factor = 0.225  # How fast to move toward target (0.05 = very slow, 0.15 = fast) - 10% slower
 min_change_threshold = 1  # Only send to Arduino if change >= 1 degree
 
 # Dynamic servo limits (will be set during calibration)
 servo_limits = [(0, 180), (0, 180), (0, 180), (25, 180), (0, 180), (0, 180)]  # Default limits - Thumb matches Arduino sketch (0-180°)
+servo_limits_lo = np.array([lo for lo, _ in servo_limits], np.int16)  # Vectorized copies of servo_limits
+servo_limits_hi = np.array([hi for _, hi in servo_limits], np.int16)
 servo_names = ["Thumb", "Index", "Middle", "Ring", "Pinky", "Wrist"]
 
 # MediaPipe setup
 mp_hands = mp.solutions.hands
 mp_drawing = mp.solutions.drawing_utils
 mp_drawing_styles = mp.solutions.drawing_styles
+_HANDS = None  # Shared MediaPipe Hands instance, created on first use
+_hands_lock = threading.Lock()  # Guards creation and the warmup inference
+
+# MediaPipe runs on its own thread so inference overlaps capture, drawing and display
+inference_in = queue.Queue(maxsize=1)  # Newest RGB frame waiting for inference
+inference_out = queue.Queue(maxsize=1)  # Newest MediaPipe result not yet consumed
+inference_thread = None
+
+def get_hands():
+    """Return the shared MediaPipe Hands instance, creating it on first use.
+    
+    static_image_mode=False lets MediaPipe reuse the previous frame's hand
+    ROI and skip palm detection while tracking confidence stays high; the
+    lite model (model_complexity=0) keeps the landmark pass cheap.
+    """
+    with _hands_lock:
+        return _create_hands()
+
+def _create_hands():
+    """Create the shared Hands instance if needed (caller holds _hands_lock)"""
+    global _HANDS
+    if _HANDS is None:
+        _HANDS = mp_hands.Hands(
+            static_image_mode=False,
+            max_num_hands=1,
+            model_complexity=0,
+            min_detection_confidence=0.6,
+            min_tracking_confidence=0.5
+        )
+    return _HANDS
+
+def warmup_mediapipe():
+    """Load the hand model and run one blank frame so the first real frame is fast"""
+    with _hands_lock:
+        _create_hands().process(np.zeros((256, 256, 3), np.uint8))
+
+def start_mediapipe_warmup():
+    """Warm up MediaPipe on a background thread while the user answers setup prompts"""
+    thread = threading.Thread(target=warmup_mediapipe, name="mediapipe-warmup", daemon=True)
+    thread.start()
+    return thread
+
+def put_latest(q, item):
+    """Put item in a single-slot queue, replacing anything not yet taken"""
+    try:
+        q.get_nowait()
+    except queue.Empty:
+        pass
+    q.put_nowait(item)
+
+def _inference_worker(hands):
+    """Run MediaPipe on the newest submitted frame until a None sentinel arrives"""
+    while True:
+        item = inference_in.get()
+        if item is None:
+            break
+        rgb_frame, roi, frame_w, frame_h = item
+        results = hands.process(rgb_frame)
+        if roi is not None and results.multi_hand_landmarks:
+            remap_roi_landmarks(results.multi_hand_landmarks, roi, frame_w, frame_h)
+        put_latest(inference_out, results)
+
+def remap_roi_landmarks(multi_hand_landmarks, roi, frame_w, frame_h):
+    """Convert landmarks normalized to an ROI crop back to full-frame normalized coordinates"""
+    x0, y0, x1, y1 = roi
+    scale_x = (x1 - x0) / frame_w
+    scale_y = (y1 - y0) / frame_h
+    offset_x = x0 / frame_w
+    offset_y = y0 / frame_h
+    for hand_landmarks in multi_hand_landmarks:
+        for lm in hand_landmarks.landmark:
+            lm.x = lm.x * scale_x + offset_x
+            lm.y = lm.y * scale_y + offset_y
+            lm.z *= scale_x  # z shares x's scale, which was the crop width
+
+def update_inference_roi(roi, hand_landmarks, frame_w, frame_h):
+    """Return a padded square crop (x0, y0, x1, y1) around the hand.
+    
+    The current ROI is kept while the hand stays well inside it, so
+    MediaPipe's own frame-to-frame tracking sees a stable input.
+    """
+    lm = landmarks_to_array(hand_landmarks)
+    x_min, x_max = lm[:, 0].min() * frame_w, lm[:, 0].max() * frame_w
+    y_min, y_max = lm[:, 1].min() * frame_h, lm[:, 1].max() * frame_h
+    
+    if roi is not None:
+        margin = INFERENCE_ROI_PADDING // 2
+        x0, y0, x1, y1 = roi
+        if x_min - margin >= x0 and y_min - margin >= y0 and x_max + margin <= x1 and y_max + margin <= y1:
+            return roi
+    
+    size = max(x_max - x_min, y_max - y_min) + 2 * INFERENCE_ROI_PADDING
+    size = int(min(max(size, INFERENCE_ROI_MIN_SIZE), frame_w, frame_h))
+    x0 = int(min(max((x_min + x_max - size) / 2, 0), frame_w - size))
+    y0 = int(min(max((y_min + y_max - size) / 2, 0), frame_h - size))
+    return (x0, y0, x0 + size, y0 + size)
+
+def start_inference_thread(hands):
+    """Start the background MediaPipe inference thread"""
+    global inference_thread
+    inference_thread = threading.Thread(target=_inference_worker, args=(hands,), name="mediapipe-inference", daemon=True)
+    inference_thread.start()
+
+def stop_inference_thread():
+    """Ask the inference thread to finish and wait for the frame in flight"""
+    global inference_thread
+    if inference_thread is not None:
+        put_latest(inference_in, None)
+        inference_thread.join(timeout=2)
+        inference_thread = None
 
 def get_window_list() -> List[dict]:
     """Get list of all windows using Quartz (macOS native)"""
+    global _window_list_cache
+    
     if not WINDOW_CAPTURE_AVAILABLE:
         return []
     
@@ -106,41 +299,48 @@ def get_window_list() -> List[dict]:
     
     # Try Quartz first (macOS native - best performance)
     if QUARTZ_AVAILABLE:
+        # Reuse a recent scan instead of hitting the window server again
+        cached_at, cached_windows = _window_list_cache
+        if cached_windows and time.monotonic() - cached_at < WINDOW_LIST_CACHE_TTL:
+            return cached_windows
+        
         try:
-            # Get all window info using Quartz
-            window_list = Quartz.CGWindowListCopyWindowInfo(
-                Quartz.kCGWindowListOptionOnScreenOnly | Quartz.kCGWindowListExcludeDesktopElements,
-                Quartz.kCGNullWindowID
-            )
-            
-            for window_info in window_list:
-                # Get window properties
-                window_id = window_info.get('kCGWindowNumber', 0)
-                window_name = window_info.get('kCGWindowName', '')
-                app_name = window_info.get('kCGWindowOwnerName', '')
-                bounds = window_info.get('kCGWindowBounds', {})
-                layer = window_info.get('kCGWindowLayer', 0)
+            # Drain autoreleased Quartz objects per scan so they don't accumulate
+            with objc.autorelease_pool():
+                # Get all window info using Quartz
+                window_list = Quartz.CGWindowListCopyWindowInfo(
+                    Quartz.kCGWindowListOptionOnScreenOnly | Quartz.kCGWindowListExcludeDesktopElements,
+                    Quartz.kCGNullWindowID
+                )
                 
-                # Filter out system windows and get only user windows
-                if (window_name and app_name and 
-                    layer == 0 and  # Normal window layer
-                    bounds.get('Width', 0) > 50 and bounds.get('Height', 0) > 50 and
-                    'Menubar' not in app_name and 'Dock' not in app_name):
+                for window_info in window_list:
+                    # Get window properties
+                    window_id = window_info.get('kCGWindowNumber', 0)
+                    window_name = window_info.get('kCGWindowName', '')
+                    app_name = window_info.get('kCGWindowOwnerName', '')
+                    bounds = window_info.get('kCGWindowBounds', {})
+                    layer = window_info.get('kCGWindowLayer', 0)
                     
-                    windows.append({
-                        'id': window_id,
-                        'title': window_name,
-                        'app': app_name,
-                        'frame': {
-                            'x': int(bounds.get('X', 0)),
-                            'y': int(bounds.get('Y', 0)),
-                            'w': int(bounds.get('Width', 0)),
-                            'h': int(bounds.get('Height', 0))
-                        },
-                        'quartz_info': window_info
-                    })
+                    # Filter out system windows and get only user windows
+                    if (window_name and app_name and 
+                        layer == 0 and  # Normal window layer
+                        bounds.get('Width', 0) > 50 and bounds.get('Height', 0) > 50 and
+                        'Menubar' not in app_name and 'Dock' not in app_name):
+                        
+                        windows.append({
+                            'id': int(window_id),
+                            'title': str(window_name),
+                            'app': str(app_name),
+                            'frame': {
+                                'x': int(bounds.get('X', 0)),
+                                'y': int(bounds.get('Y', 0)),
+                                'w': int(bounds.get('Width', 0)),
+                                'h': int(bounds.get('Height', 0))
+                            }
+                        })
             
             if windows:
+                _window_list_cache = (time.monotonic(), windows)
                 print(f"✅ Found {len(windows)} windows using Quartz")
                 return windows
                 
@@ -161,58 +361,40 @@ def get_window_list() -> List[dict]:
     except (subprocess.TimeoutExpired, FileNotFoundError, json.JSONDecodeError):
         pass
     
-    # Final fallback to AppleScript
-    try:
-        result = subprocess.run(['osascript', '-e', '''
-            tell application "System Events"
-                set windowList to {}
-                repeat with proc in (every process whose background only is false)
-                    try
-                        repeat with win in (every window of proc)
-                            set windowList to windowList & {name of proc & " - " & name of win}
-                        end repeat
-                    end try
-                end repeat
-                return windowList
-            end tell
-        '''], capture_output=True, text=True, timeout=10)
-        
-        if result.returncode == 0:
-            window_names = result.stdout.strip().split(', ')
-            windows = [{'id': i, 'title': name.strip(), 'app': name.split(' - ')[0], 
-                      'frame': None} for i, name in enumerate(window_names) if name.strip()]
+    # Off macOS, pygetwindow wraps the platform's native window API
+    if sys.platform != "darwin" and PYGETWINDOW_AVAILABLE:
+        try:
+            windows = [{'id': None, 'title': w.title, 'app': w.title,
+                       'frame': {'x': w.left, 'y': w.top, 'w': w.width, 'h': w.height}}
+                      for w in gw.getAllWindows() if w.title and w.width > 50 and w.height > 50]
             if windows:
-                print(f"✅ Found {len(windows)} windows using AppleScript")
+                print(f"✅ Found {len(windows)} windows using pygetwindow")
                 return windows
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
+        except Exception as e:
+            print(f"Warning: pygetwindow failed: {e}")
     
     print("❌ No windows found with any method")
     return []
 
+# Window text patterns for video call apps and for our own preview windows (substring matches)
+VIDEO_CALL_RE = re.compile(
+    r"zoom|meeting|facetime|teams|skype|discord|webex|hangouts|meet|call|conference|video|whatsapp|"
+    r"messenger|telegram|signal|slack call|gotomeeting|bluejeans|jitsi|whereby|around|mmhmm",
+    re.IGNORECASE
+)
+EXCLUDED_WINDOW_RE = re.compile(r"hand tracker|robotic hand control", re.IGNORECASE)
+
 def find_video_call_window(windows: List[dict]) -> Optional[dict]:
     """Find a video call window automatically"""
-    video_call_keywords = [
-        'zoom', 'meeting', 'facetime', 'teams', 'skype', 'discord', 'webex',
-        'hangouts', 'meet', 'call', 'conference', 'video', 'whatsapp',
-        'messenger', 'telegram', 'signal', 'slack call', 'gotomeeting',
-        'bluejeans', 'jitsi', 'whereby', 'around', 'mmhmm'
-    ]
-    
-    # Exclude our own window to prevent infinite loops
-    excluded_keywords = ['hand tracker', 'simple hand tracker', 'robotic hand control']
-    
     for window in windows:
-        window_text = f"{window['app']} {window['title']}".lower()
+        window_text = f"{window['app']} {window['title']}"
         
         # Skip our own tracking window to prevent feedback loops
-        is_excluded = any(excluded in window_text for excluded in excluded_keywords)
-        if is_excluded:
+        if EXCLUDED_WINDOW_RE.search(window_text):
             continue
-            
-        for keyword in video_call_keywords:
-            if keyword in window_text:
-                return window
+        
+        if VIDEO_CALL_RE.search(window_text):
+            return window
     
     return None
 
@@ -265,14 +447,8 @@ def select_window() -> Optional[Tuple[int, int, int, int]]:
     print("\n📋 Available Windows:")
     
     # Filter out our own hand tracker window to prevent infinite loops
-    excluded_keywords = ['hand tracker', 'simple hand tracker', 'robotic hand control']
-    filtered_windows = []
-    
-    for window in windows[:20]:  # Show max 20 windows
-        window_text = f"{window['app']} {window['title']}".lower()
-        is_excluded = any(excluded in window_text for excluded in excluded_keywords)
-        if not is_excluded:
-            filtered_windows.append(window)
+    filtered_windows = [window for window in windows[:20]  # Show max 20 windows
+                        if not EXCLUDED_WINDOW_RE.search(f"{window['app']} {window['title']}")]
     
     if not filtered_windows:
         print("❌ No suitable windows found (excluding hand tracker windows)")
@@ -328,6 +504,16 @@ def select_window() -> Optional[Tuple[int, int, int, int]]:
         print(f"❌ Invalid input: {e}")
         return None
 
+_BOUNDS_RE = re.compile(r"-?\d+")
+
+@lru_cache(maxsize=64)
+def _parse_bounds(bounds_str: str) -> Optional[Tuple[int, int, int, int]]:
+    """Parse an AppleScript "x, y, width, height" string into a tuple of ints"""
+    nums = _BOUNDS_RE.findall(bounds_str)
+    if len(nums) < 4:
+        return None
+    return tuple(int(n) for n in nums[:4])
+
 def get_window_bounds(window_title: str) -> Optional[Tuple[int, int, int, int]]:
     """Get window bounds using improved AppleScript"""
     try:
@@ -376,18 +562,14 @@ def get_window_bounds(window_title: str) -> Optional[Tuple[int, int, int, int]]:
             print(f"🔍 AppleScript result: '{bounds_str}'")
             
             # Parse bounds: "x,y,width,height" (AppleScript may add extra spaces/commas)
-            try:
-                # Clean up the string and split properly
-                clean_bounds = bounds_str.replace(' ,, ', ',').replace(',,', ',').strip()
-                parts = [p.strip() for p in clean_bounds.split(',') if p.strip()]
-                
-                if len(parts) >= 4:
-                    x, y, width, height = [int(parts[i]) for i in range(4)]
-                    if width > 0 and height > 0:
-                        print(f"✅ Window bounds: x={x}, y={y}, width={width}, height={height}")
-                        return (x, y, width, height)
-            except (ValueError, IndexError) as e:
-                print(f"⚠️ Could not parse bounds '{bounds_str}': {e}")
+            bounds = _parse_bounds(bounds_str)
+            if bounds:
+                x, y, width, height = bounds
+                if width > 0 and height > 0:
+                    print(f"✅ Window bounds: x={x}, y={y}, width={width}, height={height}")
+                    return bounds
+            else:
+                print(f"⚠️ Could not parse bounds '{bounds_str}'")
     
     except Exception as e:
         print(f"Warning: Could not get window bounds: {e}")
@@ -422,6 +604,55 @@ def select_screen_region() -> Optional[Tuple[int, int, int, int]]:
         print(f"❌ Invalid input: {e}")
         return None
 
+def _find_window_by_identity(app_name: str, window_title: str) -> Optional[Tuple[int, Tuple[int, int, int, int]]]:
+    """Find a window's current ID and bounds by owner app and title using one Quartz scan"""
+    with objc.autorelease_pool():
+        window_list = Quartz.CGWindowListCopyWindowInfo(
+            Quartz.kCGWindowListOptionAll,
+            Quartz.kCGNullWindowID
+        )
+        
+        for window_info in window_list:
+            if (window_info.get('kCGWindowOwnerName', '') != app_name or
+                window_info.get('kCGWindowName', '') != window_title):
+                continue
+            
+            bounds = window_info.get('kCGWindowBounds', {})
+            width = int(bounds.get('Width', 0))
+            height = int(bounds.get('Height', 0))
+            if width > 0 and height > 0:
+                window_id = int(window_info.get('kCGWindowNumber', 0))
+                return window_id, (int(bounds.get('X', 0)), int(bounds.get('Y', 0)), width, height)
+    
+    return None
+
+def watch_window_activation():
+    """Mark the tracked window's bounds stale whenever the active application changes"""
+    global workspace_observer, bounds_refresh_interval
+    
+    if not APPKIT_AVAILABLE or workspace_observer is not None:
+        return
+    
+    def mark_bounds_dirty(notification):
+        global bounds_dirty
+        bounds_dirty = True
+    
+    # Delivered through the Cocoa event loop that cv2.waitKey already pumps
+    notification_center = NSWorkspace.sharedWorkspace().notificationCenter()
+    workspace_observer = notification_center.addObserverForName_object_queue_usingBlock_(
+        NSWorkspaceDidActivateApplicationNotification, None, None, mark_bounds_dirty
+    )
+    bounds_refresh_interval = BOUNDS_REFRESH_INTERVAL
+
+def should_refresh_bounds(frame_count: int) -> bool:
+    """Refresh bounds after an activation change, or on a slow fallback interval"""
+    global bounds_dirty
+    
+    if bounds_dirty or frame_count % bounds_refresh_interval == 0:
+        bounds_dirty = False
+        return True
+    return False
+
 def update_window_position() -> Optional[Tuple[int, int, int, int]]:
     """Update the position of the tracked window using Quartz"""
     global tracked_window_info
@@ -435,15 +666,13 @@ def update_window_position() -> Optional[Tuple[int, int, int, int]]:
             window_id = tracked_window_info['id']
             
             # Get window info by ID using Quartz
-            window_list = Quartz.CGWindowListCopyWindowInfo(
-                Quartz.kCGWindowListOptionIncludingWindow,
-                window_id
-            )
-            
-            if window_list and len(window_list) > 0:
-                window_info = window_list[0]
-                bounds = window_info.get('kCGWindowBounds', {})
+            with objc.autorelease_pool():
+                window_list = Quartz.CGWindowListCopyWindowInfo(
+                    Quartz.kCGWindowListOptionIncludingWindow,
+                    window_id
+                )
                 
+                bounds = window_list[0].get('kCGWindowBounds', {}) if window_list else None
                 if bounds:
                     x = int(bounds.get('X', 0))
                     y = int(bounds.get('Y', 0))
@@ -454,42 +683,14 @@ def update_window_position() -> Optional[Tuple[int, int, int, int]]:
                         tracked_window_info['last_bounds'] = (x, y, width, height)
                         return (x, y, width, height)
         
-        # Fallback to AppleScript
-        app_name = tracked_window_info['app']
-        window_title = tracked_window_info['title']
-        
-        script = f'''
-        try
-            tell application "System Events"
-                tell application process "{app_name}"
-                    set targetWindow to first window
-                    set windowPosition to position of targetWindow
-                    set windowSize to size of targetWindow
-                    set windowX to item 1 of windowPosition
-                    set windowY to item 2 of windowPosition
-                    set windowWidth to item 1 of windowSize
-                    set windowHeight to item 2 of windowSize
-                    return windowX & "," & windowY & "," & windowWidth & "," & windowHeight
-                end tell
-            end tell
-        on error
-            return "0,0,640,480"
-        end try
-        '''
-        
-        result = subprocess.run(['osascript', '-e', script], 
-                              capture_output=True, text=True, timeout=2)
-        
-        if result.returncode == 0:
-            bounds_str = result.stdout.strip()
-            clean_bounds = bounds_str.replace(' ,, ', ',').replace(',,', ',').strip()
-            parts = [p.strip() for p in clean_bounds.split(',') if p.strip()]
-            
-            if len(parts) >= 4:
-                x, y, width, height = [int(parts[i]) for i in range(4)]
-                if width > 0 and height > 0:
-                    tracked_window_info['last_bounds'] = (x, y, width, height)
-                    return (x, y, width, height)
+        # Window ID went stale - re-resolve the window by app and title
+        if QUARTZ_AVAILABLE:
+            match = _find_window_by_identity(tracked_window_info['app'], tracked_window_info['title'])
+            if match:
+                window_id, bounds = match
+                tracked_window_info['id'] = window_id
+                tracked_window_info['last_bounds'] = bounds
+                return bounds
     
     except Exception as e:
         # Silently fail and use last known position
@@ -497,57 +698,62 @@ def update_window_position() -> Optional[Tuple[int, int, int, int]]:
     
     return tracked_window_info.get('last_bounds')
 
+def downscale_for_inference(frame: np.ndarray) -> np.ndarray:
+    """Shrink a captured frame so its longest side is at most INFERENCE_MAX_DIM"""
+    height, width = frame.shape[:2]
+    scale = INFERENCE_MAX_DIM / max(height, width)
+    
+    if scale >= 1.0:
+        return frame
+    return cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+def cgimage_to_rgb(image) -> Optional[np.ndarray]:
+    """Convert a CGImage to an RGB frame by reading its backing pixel data directly"""
+    img_width = Quartz.CGImageGetWidth(image)
+    img_height = Quartz.CGImageGetHeight(image)
+    
+    if img_width == 0 or img_height == 0:
+        return None
+    
+    # Wrap the image's own pixel bytes instead of redrawing into a bitmap context
+    bytes_per_row = Quartz.CGImageGetBytesPerRow(image)
+    data = Quartz.CGDataProviderCopyData(Quartz.CGImageGetDataProvider(image))
+    frame = np.frombuffer(data, dtype=np.uint8)
+    frame = frame.reshape((img_height, bytes_per_row // 4, 4))[:, :img_width]
+    
+    frame = downscale_for_inference(frame)
+    
+    # Window server images are normally 32-bit little-endian with alpha first (BGRA in memory)
+    bitmap_info = Quartz.CGImageGetBitmapInfo(image)
+    alpha_info = bitmap_info & Quartz.kCGBitmapAlphaInfoMask
+    little_endian = (bitmap_info & Quartz.kCGBitmapByteOrderMask) == Quartz.kCGBitmapByteOrder32Little
+    alpha_first = alpha_info in (Quartz.kCGImageAlphaPremultipliedFirst,
+                                 Quartz.kCGImageAlphaFirst,
+                                 Quartz.kCGImageAlphaNoneSkipFirst)
+    
+    if little_endian and alpha_first:
+        return cv2.cvtColor(frame, cv2.COLOR_BGRA2RGB)
+    return cv2.cvtColor(frame, cv2.COLOR_RGBA2RGB)
+
 def capture_window_directly(window_id: int) -> Optional[np.ndarray]:
-    """Capture a specific window directly using its window ID (Quartz native)"""
+    """Capture a specific window directly using its window ID (Quartz native), as RGB"""
     if not QUARTZ_AVAILABLE:
         return None
     
     try:
         # Capture the specific window using its ID
-        screenshot = Quartz.CGWindowListCreateImage(
-            Quartz.CGRectNull,  # Capture entire window
-            Quartz.kCGWindowListOptionIncludingWindow,
-            window_id,
-            Quartz.kCGWindowImageBoundsIgnoreFraming | Quartz.kCGWindowImageDefault
-        )
-        
-        if screenshot:
-            # Convert CGImage to numpy array
-            img_width = Quartz.CGImageGetWidth(screenshot)
-            img_height = Quartz.CGImageGetHeight(screenshot)
-            
-            if img_width == 0 or img_height == 0:
-                return None
-            
-            # Create bitmap context
-            bytes_per_row = 4 * img_width
-            bitmap_data = bytearray(bytes_per_row * img_height)
-            
-            bitmap_context = Quartz.CGBitmapContextCreate(
-                bitmap_data,
-                img_width,
-                img_height,
-                8,  # bits per component
-                bytes_per_row,
-                Quartz.CGColorSpaceCreateDeviceRGB(),
-                Quartz.kCGImageAlphaPremultipliedLast
+        # Release the CGImage and its pixel data every frame instead of letting them pile up
+        with objc.autorelease_pool():
+            screenshot = Quartz.CGWindowListCreateImage(
+                Quartz.CGRectNull,  # Capture entire window
+                Quartz.kCGWindowListOptionIncludingWindow,
+                window_id,
+                Quartz.kCGWindowImageBoundsIgnoreFraming | Quartz.kCGWindowImageDefault
             )
             
-            if bitmap_context:
-                # Draw the image into the bitmap context
-                Quartz.CGContextDrawImage(
-                    bitmap_context,
-                    Quartz.CGRectMake(0, 0, img_width, img_height),
-                    screenshot
-                )
-                
-                # Convert to numpy array and reshape
-                frame = np.frombuffer(bitmap_data, dtype=np.uint8)
-                frame = frame.reshape((img_height, img_width, 4))
-                
-                # Convert from RGBA to BGR for OpenCV
-                frame = cv2.cvtColor(frame, cv2.COLOR_RGBA2BGR)
-                
+            if screenshot:
+                frame = cgimage_to_rgb(screenshot)
+                del screenshot
                 return frame
         
     except Exception as e:
@@ -556,8 +762,22 @@ def capture_window_directly(window_id: int) -> Optional[np.ndarray]:
     
     return None
 
+def get_sct():
+    """Return this thread's mss instance, creating it on first use"""
+    sct = getattr(sct_local, 'sct', None)
+    if sct is None:
+        sct = sct_local.sct = mss.mss()
+    return sct
+
+def close_sct():
+    """Close this thread's mss instance if one was created"""
+    sct = getattr(sct_local, 'sct', None)
+    if sct is not None:
+        sct.close()
+        sct_local.sct = None
+
 def capture_screen_region(region: Tuple[int, int, int, int]) -> Optional[np.ndarray]:
-    """Capture screen content - uses direct window capture if window ID available"""
+    """Capture screen content as RGB - uses direct window capture if window ID available"""
     global tracked_window_info, screen_capture_region
     
     if not SCREEN_CAPTURE_AVAILABLE:
@@ -571,7 +791,7 @@ def capture_screen_region(region: Tuple[int, int, int, int]) -> Optional[np.ndar
         frame_count = tracked_window_info.get('frame_count', 0)
         tracked_window_info['frame_count'] = frame_count + 1
         
-        if frame_count % 30 == 0:  # Update every 30 frames
+        if should_refresh_bounds(frame_count):
             new_bounds = update_window_position()
             if new_bounds:
                 screen_capture_region = new_bounds
@@ -585,7 +805,7 @@ def capture_screen_region(region: Tuple[int, int, int, int]) -> Optional[np.ndar
         frame_count = tracked_window_info.get('frame_count', 0)
         tracked_window_info['frame_count'] = frame_count + 1
         
-        if frame_count % 30 == 0:
+        if should_refresh_bounds(frame_count):
             new_bounds = update_window_position()
             if new_bounds and new_bounds != region:
                 print(f"🔄 Window moved: {region} → {new_bounds}")
@@ -599,54 +819,26 @@ def capture_screen_region(region: Tuple[int, int, int, int]) -> Optional[np.ndar
             # Use Quartz for screen region capture
             region_rect = Quartz.CGRectMake(x, y, width, height)
             
-            screenshot = Quartz.CGWindowListCreateImage(
-                region_rect,
-                Quartz.kCGWindowListOptionOnScreenOnly,
-                Quartz.kCGNullWindowID,
-                Quartz.kCGWindowImageDefault
-            )
-            
-            if screenshot:
-                img_width = Quartz.CGImageGetWidth(screenshot)
-                img_height = Quartz.CGImageGetHeight(screenshot)
-                
-                bytes_per_row = 4 * img_width
-                bitmap_data = bytearray(bytes_per_row * img_height)
-                
-                bitmap_context = Quartz.CGBitmapContextCreate(
-                    bitmap_data,
-                    img_width,
-                    img_height,
-                    8,
-                    bytes_per_row,
-                    Quartz.CGColorSpaceCreateDeviceRGB(),
-                    Quartz.kCGImageAlphaPremultipliedLast
+            with objc.autorelease_pool():
+                screenshot = Quartz.CGWindowListCreateImage(
+                    region_rect,
+                    Quartz.kCGWindowListOptionOnScreenOnly,
+                    Quartz.kCGNullWindowID,
+                    Quartz.kCGWindowImageDefault
                 )
                 
-                if bitmap_context:
-                    Quartz.CGContextDrawImage(
-                        bitmap_context,
-                        Quartz.CGRectMake(0, 0, img_width, img_height),
-                        screenshot
-                    )
-                    
-                    frame = np.frombuffer(bitmap_data, dtype=np.uint8)
-                    frame = frame.reshape((img_height, img_width, 4))
-                    frame = cv2.cvtColor(frame, cv2.COLOR_RGBA2BGR)
-                    
+                if screenshot:
+                    frame = cgimage_to_rgb(screenshot)
+                    del screenshot
                     return frame
         
         # Final fallback to mss
         if not QUARTZ_AVAILABLE:
-            global sct
-            if not sct:
-                import mss
-                sct = mss.mss()
-            
+            sct = get_sct()
             monitor = {"top": y, "left": x, "width": width, "height": height}
             screenshot = sct.grab(monitor)
-            frame = np.array(screenshot)
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
+            frame = downscale_for_inference(np.array(screenshot))
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGRA2RGB)
             return frame
             
     except Exception as e:
@@ -728,27 +920,29 @@ async def scan_for_hiwonder():
         return False
     
     print("🔍 Scanning for Hiwonder BLE device...")
-    try:
-        devices = await BleakScanner.discover(timeout=10.0)
-        print(f"📱 Found {len(devices)} BLE devices")
-        
-        hiwonder_found = False
-        for i, device in enumerate(devices):
-            is_hiwonder = (device.name == HIWONDER_DEVICE_NAME or 
-                          device.address == HIWONDER_MAC or 
-                          (device.name and "hiwonder" in device.name.lower()))
-            
-            if is_hiwonder:
-                rssi = getattr(device, 'rssi', 'N/A')
-                print(f"🎯 Found Hiwonder BLE device: {device.name} ({device.address}) RSSI: {rssi}dBm")
-                hiwonder_found = True
-                break
+    found = asyncio.Event()
+    
+    def on_detection(device, advertisement_data):
+        is_hiwonder = (device.name == HIWONDER_DEVICE_NAME or 
+                      device.address == HIWONDER_MAC or 
+                      (device.name and "hiwonder" in device.name.lower()))
         
-        if not hiwonder_found:
+        if is_hiwonder and not found.is_set():
+            print(f"🎯 Found Hiwonder BLE device: {device.name} ({device.address}) RSSI: {advertisement_data.rssi}dBm")
+            found.set()
+    
+    try:
+        # Stop scanning as soon as the device advertises instead of waiting out the timeout
+        scanner = BleakScanner(detection_callback=on_detection)
+        await scanner.start()
+        try:
+            await asyncio.wait_for(found.wait(), timeout=10.0)
+        except asyncio.TimeoutError:
             print(f"❌ Hiwonder device not found in scan")
-            print(f"💡 Scanned {len(devices)} devices")
+        finally:
+            await scanner.stop()
         
-        return hiwonder_found
+        return found.is_set()
         
     except Exception as e:
         print(f"❌ BLE scan failed: {e}")
@@ -756,7 +950,7 @@ async def scan_for_hiwonder():
 
 async def connect_to_hiwonder_ble():
     """Connect to Hiwonder BLE device using proven test script logic"""
-    global ble_client, ble_write_char, is_ble_connected
+    global ble_client, ble_write_char, ble_write_response, is_ble_connected
     
     # First scan for the device
     print("🔗 Testing connection to Hiwonder BLE device...")
@@ -794,6 +988,10 @@ async def connect_to_hiwonder_ble():
             
             if target_service and target_char:
                 ble_write_char = target_char  # Store the characteristic object
+                ble_write_response = "write-without-response" not in target_char.properties
+                if not ble_write_response and not await servo_packet_fits_mtu():
+                    # Long writes need the acknowledged write procedure
+                    ble_write_response = "write" in target_char.properties
                 is_ble_connected = True
                 print("🤖 Ready for servo control!")
                 return True
@@ -814,6 +1012,23 @@ async def connect_to_hiwonder_ble():
                 pass
         return False
 
+async def servo_packet_fits_mtu():
+    """Negotiate the ATT MTU once and check a servo packet fits in a single write"""
+    # BlueZ only exchanges the MTU on request; CoreBluetooth negotiates it on connect
+    acquire_mtu = getattr(getattr(ble_client, "_backend", None), "_acquire_mtu", None)
+    if acquire_mtu:
+        try:
+            await acquire_mtu()
+        except Exception as e:
+            print(f"⚠️ MTU negotiation failed: {e}")
+    
+    mtu = ble_client.mtu_size
+    if mtu - 3 < SERVO_PACKET_STRUCT.size:  # 3 bytes of ATT header per write
+        print(f"⚠️ BLE MTU {mtu} too small for {SERVO_PACKET_STRUCT.size}-byte servo packets, using acknowledged writes")
+        return False
+    print(f"📏 BLE MTU {mtu}: servo packets fit in a single write")
+    return True
+
 async def send_ble_servo_angles():
     """Send servo angles via BLE using official Hiwonder protocol"""
     global ble_client, ble_write_char, is_ble_connected
@@ -826,7 +1041,7 @@ async def send_ble_servo_angles():
         packet = build_hiwonder_servo_packet(servo_angles, time_ms=1000)
         
         # Send via BLE
-        await ble_client.write_gatt_char(ble_write_char, packet, response=False)
+        await ble_client.write_gatt_char(ble_write_char, packet, response=ble_write_response)
         return True
         
     except Exception as e:
@@ -836,136 +1051,204 @@ async def send_ble_servo_angles():
 
 def angle_to_position(angle):
     """Convert 0-180 angle to Hiwonder servo position (1100-1950)"""
-    # Map 0-180 to 1100-1950 (standard Hiwonder range)
-    return int(1100 + (angle / 180.0) * (1950 - 1100))
+    # Map 0-180 to 1100-1950 (standard Hiwonder range), integer-only
+    return 1100 + int(angle) * (1950 - 1100) // 180
+
+# Servo move packet: header x2, length, function, servo count, time (u16 LE), then (id, position u16 LE) per servo
+SERVO_COUNT = 6
+SERVO_PACKET_STRUCT = struct.Struct("<BBBBBH" + "BH" * SERVO_COUNT)
+SERVO_PACKET_LENGTH = 1 + 1 + 2 + SERVO_COUNT * 3  # func + count + time + (id+pos_low+pos_high)*6
+SERVO_PACKET_FIELDS = [FRAME_HEADER, FRAME_HEADER, SERVO_PACKET_LENGTH, CMD_SERVO_MOVE, SERVO_COUNT, 0]
+for _servo_id in range(1, SERVO_COUNT + 1):
+    SERVO_PACKET_FIELDS += (_servo_id, 0)  # Servo ID (1-6), position filled in per packet
+SERVO_PACKET_BUFFER = bytearray(SERVO_PACKET_STRUCT.size)  # Reused by every build on the I/O thread
+SERVO_PACKET_VIEW = memoryview(SERVO_PACKET_BUFFER)
 
 def build_hiwonder_servo_packet(servo_angles, time_ms=1000):
-    """Build servo control packet using official Hiwonder protocol"""
-    packet = bytearray()
-    
-    # Frame header (2 bytes)
-    packet.append(FRAME_HEADER)  # 0x55
-    packet.append(FRAME_HEADER)  # 0x55
-    
-    # Calculate number of bytes (function + servo_count + time + servo_data)
-    servo_count = len(servo_angles)
-    data_bytes = 1 + 1 + 2 + (servo_count * 3)  # func + count + time + (id+pos_low+pos_high)*6
-    packet.append(data_bytes)  # Number
-    
-    # Function
-    packet.append(CMD_SERVO_MOVE)  # 0x03
-    
-    # Servo count
-    packet.append(servo_count)  # 6 servos
-    
-    # Time (little endian)
-    packet.append(time_ms & 0xFF)        # time_low
-    packet.append((time_ms >> 8) & 0xFF) # time_high
+    """Build servo control packet using official Hiwonder protocol.
     
-    # Servo data
-    for i, angle in enumerate(servo_angles):
-        position = angle_to_position(angle)
-        packet.append(i + 1)                    # Servo ID (1-6)
-        packet.append(position & 0xFF)          # position_low
-        packet.append((position >> 8) & 0xFF)   # position_high
+    Returns a view of a shared buffer that the next call overwrites, so
+    only call this from the servo I/O thread and write the packet out
+    before building another.
+    """
+    fields = SERVO_PACKET_FIELDS.copy()
+    fields[5] = time_ms
+    # Same integer mapping as angle_to_position, for all servos at once
+    fields[7::2] = (1100 + np.asarray(servo_angles, dtype=np.int32) * (1950 - 1100) // 180).tolist()
     
-    return packet
+    SERVO_PACKET_STRUCT.pack_into(SERVO_PACKET_BUFFER, 0, *fields)
+    return SERVO_PACKET_VIEW
+
+@njit(cache=True)
+def _smooth_step(state, lo, hi, factor, threshold):
+    """One smoothing step over a (3, 6) servo state block in place; True if any servo moved"""
+    changed = False
+    for i in range(state.shape[1]):
+        # Exponential smoothing toward the target, then servo limits
+        smoothed = state[SERVO_SM, i] + factor * (state[SERVO_TGT, i] - state[SERVO_SM, i])
+        state[SERVO_SM, i] = min(max(smoothed, lo[i]), hi[i])
+        
+        # Whole degrees for the servo, only when the change is significant (reduces jitter)
+        new_angle = np.rint(state[SERVO_SM, i])
+        if abs(new_angle - state[SERVO_CUR, i]) >= threshold:
+            state[SERVO_CUR, i] = new_angle
+            changed = True
+    return changed
 
 def smooth_servo_angles():
     """Apply exponential smoothing to servo angles"""
-    global smoothed_angles, servo_angles, target_angles
+    # new = old + factor * (target - old), computed in float32 like the state itself
+    return bool(_smooth_step(servo_state, servo_limits_lo, servo_limits_hi,
+                             np.float32(smoothing_factor), min_change_threshold))
+
+# Compile the smoothing kernel up front, on a scratch copy of the state
+if NUMBA_AVAILABLE:
+    _smooth_step(servo_state.copy(), servo_limits_lo, servo_limits_hi, np.float32(smoothing_factor), min_change_threshold)
+
+def _run_io_loop(loop):
+    """Thread target: make loop current for this thread and run it forever"""
+    asyncio.set_event_loop(loop)
+    loop.run_forever()
+
+def start_io_loop():
+    """Start the servo I/O event loop thread and packet writer (once)"""
+    global io_loop, io_thread
+    
+    if io_loop is None:
+        io_loop = asyncio.new_event_loop()
+        io_thread = threading.Thread(target=_run_io_loop, args=(io_loop,), name="servo-io", daemon=True)
+        io_thread.start()
+        asyncio.run_coroutine_threadsafe(_start_packet_writer(), io_loop).result()
+    return io_loop
+
+def stop_io_loop():
+    """Stop the servo I/O event loop thread"""
+    global io_loop, io_thread
+    
+    if io_loop is not None:
+        run_io(_stop_packet_writer(), timeout=2)
+        io_loop.call_soon_threadsafe(io_loop.stop)
+        io_thread.join(timeout=2)
+        io_loop.close()
+        io_loop = None
+        io_thread = None
+
+def run_io(coro, timeout=None):
+    """Run a coroutine on the servo I/O loop and wait for its result"""
+    return asyncio.run_coroutine_threadsafe(coro, start_io_loop()).result(timeout)
+
+async def _start_packet_writer():
+    """Create the update event and writer task on the I/O loop"""
+    global servo_update_event, packet_writer_task
+    servo_update_event = asyncio.Event()
+    packet_writer_task = asyncio.get_running_loop().create_task(_packet_writer())
+
+async def _stop_packet_writer():
+    """Cancel the writer task so the I/O loop can shut down cleanly"""
+    packet_writer_task.cancel()
+    try:
+        await packet_writer_task
+    except asyncio.CancelledError:
+        pass
+
+async def write_servo_packet(packet) -> bool:
+    """Write one packet over BLE if connected, otherwise over serial"""
+    global is_ble_connected
     
-    angles_changed = False
+    if is_ble_connected and ble_client and ble_client.is_connected:
+        try:
+            await ble_client.write_gatt_char(ble_write_char, packet, response=ble_write_response)
+            return True
+        except Exception as e:
+            print(f"❌ BLE write failed: {e}")
+            is_ble_connected = False
+            return False
     
-    for i in range(6):
-        # Apply exponential smoothing: new = old + factor * (target - old)
-        smoothed_angles[i] += smoothing_factor * (target_angles[i] - smoothed_angles[i])
-        
-        # Convert to integer for servo
-        new_angle = int(round(smoothed_angles[i]))
-        
-        # Apply servo limits
-        min_angle, max_angle = servo_limits[i]
-        new_angle = max(min_angle, min(max_angle, new_angle))
-        
-        # Only update if change is significant (reduces jitter)
-        if abs(servo_angles[i] - new_angle) >= min_change_threshold:
-            servo_angles[i] = new_angle
-            angles_changed = True
+    if serial_connection:
+        try:
+            # pyserial writes block, so keep them off the event loop too; the executor
+            # thread gets its own copy since the packet buffer is reused
+            await asyncio.get_running_loop().run_in_executor(None, serial_connection.write, bytes(packet))
+            return True
+        except Exception as e:
+            print(f"Error sending command: {e}")
     
-    return angles_changed
+    return False
+
+async def write_current_angles() -> bool:
+    """Build and write a packet for the current servo angles (runs on the I/O loop)"""
+    return await write_servo_packet(build_hiwonder_servo_packet(servo_angles, time_ms=1000))
+
+async def _packet_writer():
+    """Send the newest servo angles whenever they change, skipping stale ones"""
+    last_sent_angles = None
+    while True:
+        await servo_update_event.wait()
+        servo_update_event.clear()
+        with latest_target_lock:
+            angles = latest_target.copy()
+        
+        # Nothing to do if the servos were already sent exactly these angles
+        if last_sent_angles is not None and np.array_equal(angles, last_sent_angles):
+            continue
+        if await write_servo_packet(build_hiwonder_servo_packet(angles, time_ms=1000)):
+            last_sent_angles = angles
 
 def send_servo_angles():
-    """Send all servo angles to Arduino (serial fallback - normally BLE handles this)"""
-    global serial_connection, is_ble_connected
-    
-    # Try BLE first if connected
-    if is_ble_connected:
-        # BLE requires async, so we'll handle this in the main loop
-        return True
-    
-    # Fall back to serial (for USB connections)
-    if not serial_connection:
+    """Hand the current servo angles to the I/O loop for sending without blocking"""
+    if not is_ble_connected and not serial_connection:
         return False
     
-    try:
-        # For serial connections, we assume a simple Arduino that expects our old protocol
-        # If you have the official Hiwonder Arduino code loaded, this might not work
-        # In that case, you'd need to also use the Hiwonder protocol here
-        
-        # Build packet using official Hiwonder protocol for consistency
-        packet = build_hiwonder_servo_packet(servo_angles, time_ms=1000)
-        
-        # Send packet
-        serial_connection.write(packet)
-        return True
-        
-    except Exception as e:
-        print(f"Error sending command: {e}")
-        return False
+    # Overwrite any unsent target; the servos interpolate over time_ms, so skipping is lossless
+    loop = start_io_loop()
+    with latest_target_lock:
+        np.copyto(latest_target, servo_angles)
+    loop.call_soon_threadsafe(servo_update_event.set)
+    return True
+
+# Landmark indices for the bend-angle fingers (index, middle, ring, pinky)
+BEND_TIP_IDS = np.array([8, 12, 16, 20])
+BEND_MCP_IDS = np.array([5, 9, 13, 17])
+BEND_PIP_IDS = np.array([6, 10, 14, 18])
 
 def get_raw_finger_values(hand_landmarks) -> List[float]:
     """
     Get raw finger values from hand landmarks (before mapping to servo angles)
     Returns list of 6 raw values for each finger
     """
-    landmarks = hand_landmarks.landmark
-    raw_values = []
+    lm = landmarks_to_array(hand_landmarks)
     
     # Thumb - distance from MCP to tip
-    thumb_tip = np.array([landmarks[4].x, landmarks[4].y, landmarks[4].z])
-    thumb_mcp = np.array([landmarks[2].x, landmarks[2].y, landmarks[2].z])
-    thumb_distance = np.linalg.norm(thumb_tip - thumb_mcp)
-    raw_values.append(thumb_distance)
-    
-    # Other fingers - bend angle
-    finger_configs = [
-        (8, 5, 6),   # Index finger
-        (12, 9, 10), # Middle finger  
-        (16, 13, 14), # Ring finger
-        (20, 17, 18), # Pinky finger
-    ]
-    
-    for tip_id, mcp_id, pip_id in finger_configs:
-        tip = np.array([landmarks[tip_id].x, landmarks[tip_id].y, landmarks[tip_id].z])
-        mcp = np.array([landmarks[mcp_id].x, landmarks[mcp_id].y, landmarks[mcp_id].z])
-        pip = np.array([landmarks[pip_id].x, landmarks[pip_id].y, landmarks[pip_id].z])
-        
-        mcp_to_pip = pip - mcp
-        pip_to_tip = tip - pip
-        
-        if np.linalg.norm(mcp_to_pip) > 0 and np.linalg.norm(pip_to_tip) > 0:
-            cos_angle = np.dot(mcp_to_pip, pip_to_tip) / (np.linalg.norm(mcp_to_pip) * np.linalg.norm(pip_to_tip))
-            cos_angle = np.clip(cos_angle, -1.0, 1.0)
-            bend_angle = np.arccos(cos_angle)
-            raw_values.append(bend_angle)
-        else:
-            raw_values.append(0.0)
+    thumb_distance = np.linalg.norm(lm[4] - lm[2])
     
-    # Wrist - keep neutral for now
-    raw_values.append(0.0)
+    # Other fingers - bend angle between MCP->PIP and PIP->TIP, all four at once
+    mcp_to_pip = lm[BEND_PIP_IDS] - lm[BEND_MCP_IDS]
+    pip_to_tip = lm[BEND_TIP_IDS] - lm[BEND_PIP_IDS]
+    norms = np.linalg.norm(mcp_to_pip, axis=1) * np.linalg.norm(pip_to_tip, axis=1)
+    dots = np.einsum('ij,ij->i', mcp_to_pip, pip_to_tip)
     
-    return raw_values
+    valid = norms > 0
+    cos_angles = np.divide(dots, norms, out=np.zeros(4), where=valid)
+    bend_angles = np.where(valid, np.arccos(np.clip(cos_angles, -1.0, 1.0)), 0.0)
+    
+    # Wrist - keep neutral for now
+    return [float(thumb_distance), *bend_angles.tolist(), 0.0]
+
+def quartile_sample(values, quartile):
+    """Return the sample at the given quartile (1-3) using an O(n) partition"""
+    arr = np.fromiter(values, dtype=np.float64, count=len(values))
+    k = len(arr) * quartile // 4
+    arr.partition(k)
+    return arr[k]
+
+def configure_camera(cap):
+    """Set up a webcam for low-latency tracking at 640x480"""
+    # MJPG keeps USB bandwidth low enough for full frame rate on most webcams
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+    # Keep only the newest frame queued so reads aren't several frames behind
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
 
 def calibrate_fingers():
     """
@@ -993,16 +1276,11 @@ def calibrate_fingers():
             print("❌ No camera found. Cannot calibrate.")
             return servo_limits
     
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+    configure_camera(cap)
     
     # Initialize MediaPipe
-    hands = mp_hands.Hands(
-        static_image_mode=False,
-        max_num_hands=1,
-        min_detection_confidence=0.7,
-        min_tracking_confidence=0.5
-    )
+    hands = get_hands()
+    rgb_frame = None  # Reused RGB buffer for MediaPipe input
     
     calibrated_limits = []
     
@@ -1022,11 +1300,10 @@ def calibrate_fingers():
                 continue
                 
             frame = cv2.flip(frame, 1)
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb_frame)
             rgb_frame.flags.writeable = False
             results = hands.process(rgb_frame)
-            rgb_frame.flags.writeable = True
-            frame = cv2.cvtColor(rgb_frame, cv2.COLOR_RGB2BGR)
+            rgb_frame.flags.writeable = True  # frame is still BGR, so draw on it directly
             
             if results.multi_hand_landmarks:
                 for hand_landmarks in results.multi_hand_landmarks:
@@ -1051,11 +1328,10 @@ def calibrate_fingers():
                 continue
                 
             frame = cv2.flip(frame, 1)
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb_frame)
             rgb_frame.flags.writeable = False
             results = hands.process(rgb_frame)
-            rgb_frame.flags.writeable = True
-            frame = cv2.cvtColor(rgb_frame, cv2.COLOR_RGB2BGR)
+            rgb_frame.flags.writeable = True  # frame is still BGR, so draw on it directly
             
             if results.multi_hand_landmarks:
                 for hand_landmarks in results.multi_hand_landmarks:
@@ -1072,8 +1348,8 @@ def calibrate_fingers():
         
         # Calculate min/max from collected values
         if min_values and max_values:
-            min_val = np.percentile(min_values, 25)  # Use 25th percentile to avoid outliers
-            max_val = np.percentile(max_values, 75)  # Use 75th percentile to avoid outliers
+            min_val = quartile_sample(min_values, 1)  # Use 25th percentile to avoid outliers
+            max_val = quartile_sample(max_values, 3)  # Use 75th percentile to avoid outliers
             
             # Map to servo limits
             if finger_idx == 0:  # Thumb
@@ -1102,134 +1378,164 @@ def calibrate_fingers():
     
     return calibrated_limits
 
-def calculate_finger_angles(hand_landmarks) -> List[int]:
-    """
-    Calculate servo angles from hand landmarks using calibrated limits
-    Returns list of 6 servo angles
-    """
-    # Get landmark positions
-    landmarks = hand_landmarks.landmark
-    
-    # Calculate finger bend angles based on landmark distances and joint angles
-    angles = []
-    
-    # Thumb - Use distance from tip to middle finger base (MCP) for control
-    thumb_tip = np.array([landmarks[4].x, landmarks[4].y, landmarks[4].z])
-    middle_mcp = np.array([landmarks[9].x, landmarks[9].y, landmarks[9].z])  # Middle finger MCP joint (base)
-    
-    # Calculate distance from thumb tip to middle finger base
-    thumb_to_middle_distance = np.linalg.norm(thumb_tip - middle_mcp)
-    
-    # Map distance to servo range (0-180°) with AGGRESSIVE closing
-    # When thumb touches middle finger base = fully closed (180°) - inverted mapping
-    # When thumb is far from middle finger base = fully open (0°)
-    # Use MUCH smaller distance range for aggressive closing: 0.02 to 0.08
-    normalized_distance = np.clip((thumb_to_middle_distance - 0.02) / (0.08 - 0.02), 0.0, 1.0)
-    
-    # Inverted mapping for thumb: close distance = high angle (closed), far distance = low angle (open)
-    base_thumb_angle = (1.0 - normalized_distance) * 180  # Match Arduino sketch range (0-180°)
-    
-    # Add moderate sensitivity for better control
-    thumb_angle = int(base_thumb_angle * 5.0)  # 5x sensitivity for balanced responsiveness
-    
-    # Clamp to Arduino's actual servo range (0-180°)
+# Landmark indices and servo ranges for index, middle, ring and pinky: (tip, mcp, min_angle, max_angle)
+FINGER_ANGLE_CONFIGS = np.array([
+    (8, 5, 0, 180),    # Index finger
+    (12, 9, 0, 180),   # Middle finger
+    (16, 13, 25, 180), # Ring finger (min 25°)
+    (20, 17, 0, 180),  # Pinky finger
+], dtype=np.int64)
+
+# Reused output buffer for the angle kernel
+finger_angles_out = np.empty(6, np.int32)
+
+@njit(cache=True, fastmath=True)
+def _landmark_distance(lm, a, b):
+    """Euclidean distance between landmarks a and b"""
+    dx = lm[a, 0] - lm[b, 0]
+    dy = lm[a, 1] - lm[b, 1]
+    dz = lm[a, 2] - lm[b, 2]
+    return math.sqrt(dx * dx + dy * dy + dz * dz)
+
+@njit(cache=True, fastmath=True)
+def _landmarks_to_angles(lm, configs, angles):
+    """Map a (21, 3) landmark array to 6 servo angles in place (see calculate_finger_angles)"""
+    # Thumb - distance from tip to middle finger base (MCP), inverted and aggressive
+    d = _landmark_distance(lm, 4, 9)
+    normalized_distance = min(max((d - 0.02) / (0.08 - 0.02), 0.0), 1.0)
+    thumb_angle = int((1.0 - normalized_distance) * 180 * 5.0)
     thumb_angle = max(0, min(180, thumb_angle))
-    
-    # VERY aggressive snapping to ensure tight closure
-    snap_threshold = 180 * 0.25  # 25% of 180° = 45° for much easier snapping
-    if thumb_angle >= (180 - snap_threshold):
-        thumb_angle = 180  # Snap to fully closed at 180°
-    
-    # Also snap to open when very low
-    if thumb_angle <= 15:  # Higher threshold for better open detection
-        thumb_angle = 0  # Snap to fully open
-    
-    angles.append(thumb_angle)
-    
-    # Other fingers - Use simple distance-based calculation (DIRECT mapping for correct movement)
-    finger_configs = [
-        # (tip_landmark, mcp_landmark, pip_landmark, name, min_angle, max_angle)
-        (8, 5, 6, "Index", 0, 180),     # Index finger
-        (12, 9, 10, "Middle", 0, 180),  # Middle finger  
-        (16, 13, 14, "Ring", 25, 180),  # Ring finger (min 25°)
-        (20, 17, 18, "Pinky", 0, 180), # Pinky finger
-    ]
-    
-    for tip_id, mcp_id, pip_id, name, min_angle, max_angle in finger_configs:
-        # Get 3D positions
-        tip = np.array([landmarks[tip_id].x, landmarks[tip_id].y, landmarks[tip_id].z])
-        mcp = np.array([landmarks[mcp_id].x, landmarks[mcp_id].y, landmarks[mcp_id].z])
-        
-        # Use simple distance-based calculation
-        distance = np.linalg.norm(tip - mcp)
+    # Snap to fully closed/open (conditional expressions compile to selects, not branches)
+    thumb_angle = 180 if thumb_angle >= 180 - 180 * 0.25 else thumb_angle
+    angles[0] = 0 if thumb_angle <= 15 else thumb_angle
+    
+    # Other fingers - tip to MCP distance, direct mapping
+    for f in range(4):
+        min_angle = configs[f, 2]
+        max_angle = configs[f, 3]
         
-        # Map distance to servo range (0.05 to 0.15 typical range)
-        normalized_distance = np.clip((distance - 0.05) / (0.15 - 0.05), 0.0, 1.0)
+        d = _landmark_distance(lm, configs[f, 0], configs[f, 1])
+        normalized_distance = min(max((d - 0.05) / (0.15 - 0.05), 0.0), 1.0)
+        if f == 3:
+            # Pinky gets extra sensitivity (2x)
+            normalized_distance = min(1.0, normalized_distance * 2.0)
         
-        # Pinky gets extra sensitivity (2x)
-        if name == "Pinky":
-            normalized_distance = normalized_distance * 2.0
-            normalized_distance = min(1.0, normalized_distance)  # Clamp to 1.0
-        
-        # Direct mapping: when finger is extended (large distance) = max angle (open servo)
-        # when finger is bent (small distance) = min angle (closed servo)
         servo_angle = int(normalized_distance * (max_angle - min_angle) + min_angle)
         
         # Snap to min/max when within 5% of limits
-        range_size = max_angle - min_angle
-        snap_threshold = range_size * 0.05  # 5% of range
-        
-        if servo_angle <= min_angle + snap_threshold:
-            servo_angle = min_angle  # Snap to min
-        elif servo_angle >= max_angle - snap_threshold:
-            servo_angle = max_angle  # Snap to max
+        snap_threshold = (max_angle - min_angle) * 0.05
+        snap_lo = min_angle + snap_threshold
+        snap_hi = max_angle - snap_threshold
+        servo_angle = min_angle if servo_angle <= snap_lo else (max_angle if servo_angle >= snap_hi else servo_angle)
         
-        # Ensure we can reach 0° for proper closing
-        servo_angle = max(min_angle, min(max_angle, servo_angle))
-        angles.append(servo_angle)
+        angles[f + 1] = max(min_angle, min(max_angle, servo_angle))
     
     # Wrist rotation (keep neutral for now)
-    wrist_angle = 90
-    angles.append(wrist_angle)
+    angles[5] = 90
+
+def landmarks_to_array(hand_landmarks) -> np.ndarray:
+    """Copy MediaPipe hand landmarks into a (21, 3) array in a single pass"""
+    return np.fromiter(
+        (v for lm in hand_landmarks.landmark for v in (lm.x, lm.y, lm.z)),
+        dtype=np.float64, count=21 * 3
+    ).reshape(21, 3)
+
+def calculate_finger_angles(hand_landmarks) -> List[int]:
+    """
+    Calculate servo angles from hand landmarks using calibrated limits
+    Returns list of 6 servo angles
     
-    return angles
+    Thumb: distance from tip to middle finger base, inverted (close = 180°)
+    with 5x sensitivity and snapping to fully open/closed.
+    Other fingers: tip to MCP distance mapped directly onto each finger's
+    range (pinky 2x sensitivity), snapping within 5% of the limits.
+    """
+    _landmarks_to_angles(landmarks_to_array(hand_landmarks), FINGER_ANGLE_CONFIGS, finger_angles_out)
+    return finger_angles_out.tolist()
+
+# Compile the JIT kernel up front so the first live frame doesn't pay for it
+if NUMBA_AVAILABLE:
+    _landmarks_to_angles(np.zeros((21, 3), np.float64), FINGER_ANGLE_CONFIGS, finger_angles_out)
+
+# Per-servo overlay layout: (text origin, bar top-left, bar outline bottom-right)
+OVERLAY_ROWS = [((20, y), (20, y + 5), (300, y + 15)) for y in range(35, 35 + 25 * 6, 25)]
+
+_text_sprites = {}  # (text, scale, color) -> (sprite, mask, origin in sprite, advance)
+
+def get_text_sprite(text, scale, color, thickness=2):
+    """Rasterize static overlay text once and reuse it on later frames"""
+    key = (text, scale, color)
+    if key not in _text_sprites:
+        (text_w, text_h), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)
+        pad = thickness + 2
+        sprite = np.zeros((text_h + baseline + 2 * pad, text_w + 2 * pad, 3), np.uint8)
+        cv2.putText(sprite, text, (pad, text_h + pad), cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness)
+        mask = sprite.any(axis=2, keepdims=True)
+        _text_sprites[key] = (sprite, mask, (pad, text_h + pad), text_w)
+    return _text_sprites[key]
+
+def draw_static_text(image, text, org, scale, color, thickness=2):
+    """Draw text at a putText-style origin from the sprite cache; returns the x after the text"""
+    sprite, mask, (ox, oy), advance = get_text_sprite(text, scale, color, thickness)
+    x0, y0 = org[0] - ox, org[1] - oy
+    roi = image[max(y0, 0):y0 + sprite.shape[0], max(x0, 0):x0 + sprite.shape[1]]
+    if roi.shape == sprite.shape:
+        np.copyto(roi, sprite, where=mask)
+    else:
+        # Clipped at the image edge - let OpenCV handle it
+        cv2.putText(image, text, org, cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness)
+    return org[0] + advance
+
+def darken_region(image, x0, y0, x1, y1, alpha=0.7):
+    """Darken the inclusive rectangle (x0, y0)-(x1, y1) in place, like blending in black"""
+    roi = image[max(y0, 0):y1 + 1, max(x0, 0):x1 + 1]
+    roi[:] = cv2.convertScaleAbs(roi, alpha=alpha)
+
+def start_terminal_keys():
+    """Read single keypresses from the terminal without Enter; returns (fd, settings to restore) or None"""
+    if not TERMINAL_KEYS_AVAILABLE or not sys.stdin.isatty():
+        return None
+    fd = sys.stdin.fileno()
+    old_settings = termios.tcgetattr(fd)
+    tty.setcbreak(fd)
+    return fd, old_settings
+
+def read_terminal_key(fd) -> int:
+    """Return a pending keypress as its character code, or 0xFF (like cv2.waitKey) if none"""
+    ready, _, _ = select.select([fd], [], [], 0)
+    if not ready:
+        return 0xFF
+    data = os.read(fd, 1)
+    return data[0] if data else 0xFF
 
 def draw_info_overlay(image, angles: List[int], fps: float, arduino_connected: bool):
     """Draw information overlay on the image"""
     height, width = image.shape[:2]
     
-    # Create semi-transparent overlay
-    overlay = image.copy()
+    # Semi-transparent background panels (only the panel pixels are touched)
+    darken_region(image, 10, 10, 350, 200)
+    darken_region(image, width - 180, 10, width - 10, 80)
     
-    # Draw background rectangles
-    cv2.rectangle(overlay, (10, 10), (350, 200), (0, 0, 0), -1)
-    cv2.rectangle(overlay, (width - 180, 10), (width - 10, 80), (0, 0, 0), -1)
+    # Color coding
+    if arduino_connected:
+        color = (0, 255, 0)  # Green when connected
+    else:
+        color = (0, 165, 255)  # Orange when simulating
     
-    # Blend overlay
-    cv2.addWeighted(overlay, 0.3, image, 0.7, 0, image)
+    # Bar lengths for all servos at once
+    bar_ratios = (np.asarray(angles) - servo_limits_lo) / (servo_limits_hi - servo_limits_lo)
+    bar_widths = (bar_ratios * 280).astype(int).tolist()
     
     # Draw servo angles
-    y_pos = 35
-    for i, (name, angle) in enumerate(zip(servo_names, angles)):
-        min_angle, max_angle = servo_limits[i]
-        
-        # Color coding
-        if arduino_connected:
-            color = (0, 255, 0)  # Green when connected
-        else:
-            color = (0, 165, 255)  # Orange when simulating
-        
-        text = f"{name}: {angle:3d}°"
-        cv2.putText(image, text, (20, y_pos), 
+    for name, angle, bar_width, (text_pos, bar_top, bar_bottom) in zip(servo_names, angles, bar_widths, OVERLAY_ROWS):
+        # Cached name label, then only the changing number is rasterized
+        value_x = draw_static_text(image, f"{name}: ", text_pos, 0.6, color)
+        cv2.putText(image, f"{angle:3.0f}°", (value_x, text_pos[1]),
                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
         
         # Draw angle bar
-        bar_ratio = (angle - min_angle) / (max_angle - min_angle)
-        bar_width = int(bar_ratio * 280)
-        cv2.rectangle(image, (20, y_pos + 5), (20 + bar_width, y_pos + 15), color, -1)
-        cv2.rectangle(image, (20, y_pos + 5), (300, y_pos + 15), (100, 100, 100), 1)
-        
-        y_pos += 25
+        cv2.rectangle(image, bar_top, (20 + bar_width, bar_bottom[1]), color, -1)
+        cv2.rectangle(image, bar_top, bar_bottom, (100, 100, 100), 1)
     
     # Draw FPS
     cv2.putText(image, f"FPS: {fps:.1f}", (width - 170, 40),
@@ -1247,8 +1553,7 @@ def draw_info_overlay(image, angles: List[int], fps: float, arduino_connected: b
         status_text = "Simulation Mode"
         status_color = (0, 165, 255)
     
-    cv2.putText(image, status_text, (width - 170, 65),
-               cv2.FONT_HERSHEY_SIMPLEX, 0.5, status_color, 2)
+    draw_static_text(image, status_text, (width - 170, 65), 0.5, status_color)
 
 async def try_ble_connection():
     """Try to connect via BLE first"""
@@ -1266,10 +1571,21 @@ async def try_ble_connection():
 def main():
     """Main function"""
     global serial_connection, servo_angles, target_angles, smoothed_angles, last_update_time, servo_limits, is_ble_connected, ble_client, ble_write_char
-    global screen_capture_region, use_screen_capture, sct, tracked_window_info
+    global screen_capture_region, use_screen_capture, tracked_window_info
+    
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Simple Hand Tracker with Servo Control")
+    parser.add_argument("--no-preview", action="store_true",
+                        help="Run without the preview window (headless); keys are read from the terminal and FPS is printed")
+    args = parser.parse_args()
+    headless = args.no_preview
     
     print("Simple Hand Tracker Starting...")
     
+    # Model loading overlaps with the interactive setup below
+    start_mediapipe_warmup()
+    
     # Ask for input source
     print("\n📹 INPUT SOURCE SELECTION")
     print("Choose your hand tracking input source:")
@@ -1304,6 +1620,10 @@ def main():
                 print(f"🎯 Streaming window ID {tracked_window_info['id']} via Quartz")
             else:
                 print("✅ Screen capture configured!")
+            # Notifications only arrive while cv2.waitKey pumps the preview's event loop;
+            # headless runs keep polling bounds every BOUNDS_POLL_INTERVAL frames
+            if tracked_window_info and not headless:
+                watch_window_activation()
             print("💡 Tip: To prevent feedback loops, the preview window will be minimized")
         else:
             print("⚠️ Screen capture setup failed, falling back to webcam")
@@ -1332,15 +1652,22 @@ def main():
     print("1. Yes - Run calibration (recommended)")
     print("2. No - Use default settings")
     
-    try:
-        choice = input("Enter choice (1 or 2): ").strip()
-    except EOFError:
-        print("(no input available - using default settings)")
+    if headless:
+        # Calibration guides the user through its own OpenCV window
+        print("(--no-preview - calibration needs a window, using default settings)")
         choice = "2"
+    else:
+        try:
+            choice = input("Enter choice (1 or 2): ").strip()
+        except EOFError:
+            print("(no input available - using default settings)")
+            choice = "2"
     
     if choice == "1":
         print("\n🎯 Starting calibration...")
         servo_limits = calibrate_fingers()
+        servo_limits_lo[:] = [lo for lo, _ in servo_limits]
+        servo_limits_hi[:] = [hi for _, hi in servo_limits]
         print("✅ Calibration complete! Starting hand tracking...")
     else:
         print("✅ Using default servo limits.")
@@ -1352,7 +1679,7 @@ def main():
     # Try BLE first
     try:
         print("🚀 Attempting BLE connection to Hiwonder device...")
-        ble_success = asyncio.run(try_ble_connection())
+        ble_success = run_io(try_ble_connection())
         if ble_success:
             arduino_connected = True
             connection_type = "BLE"
@@ -1401,12 +1728,7 @@ def main():
             print("⚠️ No device found - Running in simulation mode")
     
     # Initialize MediaPipe
-    hands = mp_hands.Hands(
-        static_image_mode=False,
-        max_num_hands=1,
-        min_detection_confidence=0.7,
-        min_tracking_confidence=0.5
-    )
+    start_inference_thread(get_hands())
     
     # Initialize input source
     cap = None
@@ -1420,9 +1742,10 @@ def main():
                 print("❌ No camera found. Please connect a camera and try again.")
                 return
         
-        cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-        print(f"✅ Camera opened successfully")
+        configure_camera(cap)
+        print(f"✅ Camera opened successfully (frame buffer: {int(cap.get(cv2.CAP_PROP_BUFFERSIZE))})")
+        if OPENCL_AVAILABLE:
+            print("⚡ OpenCL available - mirroring and color conversion run on the GPU")
     else:
         print(f"✅ Screen capture configured for region: {screen_capture_region}")
     
@@ -1437,13 +1760,28 @@ def main():
     print("  - Press 'c' to calibrate (center all servos)")
     print("  - Press 'o' to open hand")
     print("  - Press 'f' to make fist")
+    if headless:
+        print("  (no preview window - press keys in this terminal)")
     print()
     
     prev_time = time.time()
+    frame_idx = 0
+    frame_skip = 0
+    results = None
+    inference_roi = None  # Crop fed to MediaPipe while a hand is tracked
+    roi_misses = 0
+    last_thumb = None  # Thumbnail of the last screen frame sent to MediaPipe
+    last_show_time = 0
+    last_fps_report = prev_time
+    frames_since_report = 0
+    
+    # Without a window there is no cv2.waitKey, so keys come straight from the terminal
+    terminal_keys = start_terminal_keys() if headless else None
     
     try:
         while True:
             frame = None
+            frame_umat = None  # GPU copy of the mirrored webcam frame (OpenCL only)
             
             if use_screen_capture:
                 # Capture screen region
@@ -1464,44 +1802,89 @@ def main():
                     # If BLE is connected, disconnect gracefully before breaking
                     if is_ble_connected and ble_client:
                         try:
-                            asyncio.run(ble_client.disconnect())
+                            run_io(ble_client.disconnect(), timeout=5)
                             print("📶 BLE disconnected due to camera error")
                         except:
                             pass
                     break
                 
                 # Flip frame horizontally for mirror effect (webcam only)
-                frame = cv2.flip(frame, 1)
+                if OPENCL_AVAILABLE:
+                    frame_umat = cv2.flip(cv2.UMat(frame), 1)
+                    frame = frame_umat.get()
+                else:
+                    frame = cv2.flip(frame, 1)
             
-            # Convert to RGB for MediaPipe
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            rgb_frame.flags.writeable = False
+            # Skip inference on some frames while the hand is tracked confidently;
+            # smoothing keeps easing toward the last target in between
+            run_inference = frame_idx % (1 + frame_skip) == 0
+            frame_idx += 1
             
-            # Process hand detection
-            results = hands.process(rgb_frame)
+            # Static screen content would give the same result again
+            if run_inference and use_screen_capture:
+                thumb = cv2.resize(frame, STATIC_FRAME_THUMB_SIZE, interpolation=cv2.INTER_AREA)
+                if last_thumb is not None and cv2.norm(thumb, last_thumb, cv2.NORM_L1) < STATIC_FRAME_L1_THRESHOLD:
+                    run_inference = False
+                else:
+                    last_thumb = thumb
+            
+            frame_h, frame_w = frame.shape[:2]
+            
+            if run_inference:
+                # Only the region around a tracked hand goes to MediaPipe
+                if inference_roi is None:
+                    crop = frame
+                else:
+                    x0, y0, x1, y1 = inference_roi
+                    crop = frame[y0:y1, x0:x1]
+                
+                # Screen capture already delivers RGB; only webcam frames need converting for MediaPipe
+                if use_screen_capture:
+                    rgb_frame = np.ascontiguousarray(crop)
+                elif frame_umat is not None:
+                    # Convert on the GPU straight from the uploaded frame
+                    if inference_roi is not None:
+                        frame_umat = cv2.UMat(frame_umat, (y0, y1), (x0, x1))
+                    rgb_frame = cv2.cvtColor(frame_umat, cv2.COLOR_BGR2RGB).get()
+                else:
+                    rgb_frame = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
+                rgb_frame.flags.writeable = False
+                
+                # Hand the frame to the inference thread (drops any frame it hasn't started on)
+                put_latest(inference_in, (rgb_frame, inference_roi, frame_w, frame_h))
             
-            # Convert back to BGR for OpenCV
-            rgb_frame.flags.writeable = True
-            frame = cv2.cvtColor(rgb_frame, cv2.COLOR_RGB2BGR)
+            # Pick up the newest hand detection result, if one finished since the last frame
+            try:
+                results = inference_out.get_nowait()
+                new_results = True
+            except queue.Empty:
+                new_results = False
+            
+            if new_results:
+                if (results.multi_handedness and
+                    results.multi_handedness[0].classification[0].score >= frame_skip_confidence):
+                    frame_skip = frame_skip_confident
+                else:
+                    frame_skip = 0
+                
+                # Follow the hand with the inference crop; go back to full frame once it's lost
+                if results.multi_hand_landmarks:
+                    inference_roi = update_inference_roi(inference_roi, results.multi_hand_landmarks[0], frame_w, frame_h)
+                    roi_misses = 0
+                elif inference_roi is not None:
+                    roi_misses += 1
+                    if roi_misses >= INFERENCE_ROI_MAX_MISSES:
+                        inference_roi = None
+                        roi_misses = 0
             
             # Calculate FPS
             curr_time = time.time()
             fps = 1 / (curr_time - prev_time)
             prev_time = curr_time
             
-            # Process hand landmarks
-            if results.multi_hand_landmarks:
+            # Calculate target servo angles from each new hand pose
+            if new_results and results.multi_hand_landmarks:
                 for hand_landmarks in results.multi_hand_landmarks:
-                    # Draw landmarks on frame
-                    mp_drawing.draw_landmarks(
-                        frame,
-                        hand_landmarks,
-                        mp_hands.HAND_CONNECTIONS,
-                        mp_drawing_styles.get_default_hand_landmarks_style(),
-                        mp_drawing_styles.get_default_hand_connections_style()
-                    )
-                    
-                    # Calculate target servo angles from hand pose
                     new_target_angles = calculate_finger_angles(hand_landmarks)
                     target_angles[:] = new_target_angles
             
@@ -1513,60 +1896,81 @@ def main():
                 # Only send if angles actually changed significantly
                 if angles_changed:
                     if arduino_connected:
-                        if is_ble_connected:
-                            # Send via BLE (async)
-                            try:
-                                asyncio.run(send_ble_servo_angles())
-                            except Exception as e:
-                                print(f"BLE send error: {e}")
-                                # If BLE fails, mark as disconnected
-                                is_ble_connected = False
-                        else:
-                            # Send via serial
-                            send_servo_angles()
+                        # Hand off to the I/O thread (BLE or serial)
+                        send_servo_angles()
                     else:
                         # Print servo commands when no device connected
-                        print(f"SIM: Thumb:{servo_angles[0]:3d}° Index:{servo_angles[1]:3d}° Middle:{servo_angles[2]:3d}° Ring:{servo_angles[3]:3d}° Pinky:{servo_angles[4]:3d}° Wrist:{servo_angles[5]:3d}°")
+                        print(f"SIM: Thumb:{servo_angles[0]:3.0f}° Index:{servo_angles[1]:3.0f}° Middle:{servo_angles[2]:3.0f}° Ring:{servo_angles[3]:3.0f}° Pinky:{servo_angles[4]:3.0f}° Wrist:{servo_angles[5]:3.0f}°")
                 
                 last_update_time = curr_time
             
-            # Draw info overlay
-            draw_info_overlay(frame, servo_angles, fps, arduino_connected)
+            # Headless runs report the pipeline's frame rate instead of drawing it
+            if headless:
+                frames_since_report += 1
+                if curr_time - last_fps_report >= fps_report_interval:
+                    print(f"📈 FPS: {frames_since_report / (curr_time - last_fps_report):.1f}")
+                    last_fps_report = curr_time
+                    frames_since_report = 0
             
-            # Show frame with appropriate title and size
-            if use_screen_capture:
-                # For screen capture, use a smaller preview window with unique name
-                window_title = "🤖 Hand Tracker Preview (Screen Capture Mode)"
-                # Resize frame to smaller preview size to avoid feedback loops
-                preview_frame = cv2.resize(frame, (640, 480))
-                cv2.imshow(window_title, preview_frame)
+            # The preview refreshes at a lower rate than tracking; skipped frames aren't drawn at all
+            show_preview = not headless and curr_time - last_show_time >= preview_interval
+            if show_preview:
+                last_show_time = curr_time
                 
-                # Move window to a safe position
-                cv2.moveWindow(window_title, 50, 50)
-            else:
-                # For webcam, use normal size window
-                window_title = "🤖 Simple Hand Tracker - Webcam - Robotic Hand Control"
-                cv2.imshow(window_title, frame)
+                # Screen capture frames are RGB; convert a copy for OpenCV drawing and display
+                if use_screen_capture:
+                    frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+                
+                # Draw the latest hand landmarks (frames without a new result redraw the last one)
+                if results and results.multi_hand_landmarks:
+                    for hand_landmarks in results.multi_hand_landmarks:
+                        mp_drawing.draw_landmarks(
+                            frame,
+                            hand_landmarks,
+                            mp_hands.HAND_CONNECTIONS,
+                            mp_drawing_styles.get_default_hand_landmarks_style(),
+                            mp_drawing_styles.get_default_hand_connections_style()
+                        )
+                
+                # Draw info overlay
+                draw_info_overlay(frame, servo_angles, fps, arduino_connected)
+                
+                # Show frame with appropriate title and size
+                if use_screen_capture:
+                    # For screen capture, use a smaller preview window with unique name
+                    window_title = "🤖 Hand Tracker Preview (Screen Capture Mode)"
+                    # Resize frame to smaller preview size to avoid feedback loops
+                    preview_frame = cv2.resize(frame, (640, 480))
+                    cv2.imshow(window_title, preview_frame)
+                    
+                    # Move window to a safe position
+                    cv2.moveWindow(window_title, 50, 50)
+                else:
+                    # For webcam, use normal size window
+                    window_title = "🤖 Simple Hand Tracker - Webcam - Robotic Hand Control"
+                    cv2.imshow(window_title, frame)
             
-            # Handle keyboard input
-            key = cv2.waitKey(1) & 0xFF
+            # Handle keyboard input; the GUI event queue is only pumped alongside a preview
+            # refresh, and keys pressed in between wait there until then
+            if terminal_keys:
+                key = read_terminal_key(terminal_keys[0])
+            else:
+                key = cv2.waitKey(1) & 0xFF if show_preview else 0xFF
             if key == ord('q'):
                 break
             elif key == ord('c'):
                 # Calibrate - center all servos
-                target_angles[:] = [90, 90, 90, 90, 90, 90]
-                smoothed_angles[:] = [90.0, 90.0, 90.0, 90.0, 90.0, 90.0]
-                servo_angles[:] = [90, 90, 90, 90, 90, 90]
+                servo_state.fill(90.0)  # Current, target and smoothed rows in one go
                 if arduino_connected:
                     send_servo_angles()
                 print("Calibrated - all servos centered")
             elif key == ord('o'):
                 # Open hand
-                target_angles[:] = [0, 0, 0, 25, 0, 90]  # Min thumb (open), min others (respecting limits)
+                target_angles[:] = OPEN_HAND_ANGLES  # Min thumb (open), min others (respecting limits)
                 print("Opening hand...")
             elif key == ord('f'):
                 # Make fist
-                target_angles[:] = [180, 180, 180, 180, 180, 90]  # Max thumb (180° to match Arduino), max others
+                target_angles[:] = FIST_ANGLES  # Max thumb (180° to match Arduino), max others
                 print("Making fist...")
     
     except KeyboardInterrupt:
@@ -1574,55 +1978,45 @@ def main():
     
     finally:
         # Cleanup
+        if terminal_keys:
+            termios.tcsetattr(terminal_keys[0], termios.TCSADRAIN, terminal_keys[1])
+        
         if arduino_connected:
             # Return to neutral before closing
-            target_angles[:] = [90, 90, 90, 90, 90, 90]
-            smoothed_angles[:] = [90.0, 90.0, 90.0, 90.0, 90.0, 90.0]
-            servo_angles[:] = [90, 90, 90, 90, 90, 90]
+            servo_state.fill(90.0)  # Current, target and smoothed rows in one go
             
             if is_ble_connected:
                 try:
-                    # Send final position and disconnect
+                    # Send final position and disconnect, on the same I/O loop as every other write
                     async def cleanup_ble():
                         if ble_client and ble_client.is_connected:
-                            await send_ble_servo_angles()
-                            await ble_client.disconnect()
+                            try:
+                                await send_ble_servo_angles()
+                            finally:
+                                # Disconnect even if the final write fails
+                                await ble_client.disconnect()
                     
-                    # Create new event loop for cleanup
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    try:
-                        loop.run_until_complete(cleanup_ble())
-                    finally:
-                        loop.close()
+                    run_io(cleanup_ble(), timeout=10)
                     
                     time.sleep(0.5)
                     print("📶 Disconnected from BLE device")
                 except Exception as e:
                     print(f"⚠️ BLE cleanup error: {e}")
-                    # Force disconnect if needed
-                    try:
-                        if ble_client:
-                            loop = asyncio.new_event_loop()
-                            asyncio.set_event_loop(loop)
-                            try:
-                                loop.run_until_complete(ble_client.disconnect())
-                            finally:
-                                loop.close()
-                    except:
-                        pass
             elif serial_connection:
-                send_servo_angles()
+                run_io(write_current_angles())
                 time.sleep(0.5)
                 serial_connection.close()
                 print("🔌 Disconnected from serial device")
         
+        stop_io_loop()
+        stop_inference_thread()
+        
         # Cleanup input source
         if cap:
             cap.release()
-        if sct:
-            sct.close()
-        cv2.destroyAllWindows()
+        close_sct()
+        if not headless:
+            cv2.destroyAllWindows()
         print("👋 Hand tracking stopped.")
 
 if __name__ == "__main__":
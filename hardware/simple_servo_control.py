@@ -9,6 +9,8 @@ ESC to quit
 
 import serial
 import serial.tools.list_ports
+import os
+import select
 import struct
 import sys
 import termios
@@ -19,6 +21,9 @@ import time
 CONST_STARTBYTE1 = 0xAA
 CONST_STARTBYTE2 = 0x77
 FUNC_SET_SERVO = 0x01
+SERVO_PACKET_PREFIX = bytes([CONST_STARTBYTE1, CONST_STARTBYTE2, FUNC_SET_SERVO, 6])  # Start bytes, function, data length
+SERVO_PACKET = bytearray(SERVO_PACKET_PREFIX + bytes(6 + 1))  # Reused for every send: prefix, 6 angles, checksum
+_PREFIX_SUM = FUNC_SET_SERVO + 6  # Checksummed header bytes (function + length) never change
 
 # Current state
 current_servo = 0  # 0-5 (servo 1-6)
@@ -28,6 +33,13 @@ serial_connection = None
 # Servo limits from Arduino code
 servo_limits = [(0, 82), (0, 180), (0, 180), (25, 180), (0, 180), (0, 180)]
 servo_names = ["Thumb", "Index", "Middle", "Ring", "Pinky", "Wrist"]
+last_rendered = None  # State shown by the last print_status call
+
+# Precomputed pieces of the status display
+STATUS_BAR_WIDTH = 30
+STATUS_BARS = ["█" * filled + "░" * (STATUS_BAR_WIDTH - filled) for filled in range(STATUS_BAR_WIDTH + 1)]
+SERVO_INV_RANGES = [1.0 / (max_angle - min_angle) for min_angle, max_angle in servo_limits]
+SERVO_LABELS = [f"Servo {i+1} ({name:>6}): " for i, name in enumerate(servo_names)]
 
 def find_arduino():
     """Find Arduino port automatically"""
@@ -43,13 +55,40 @@ def find_arduino():
         return arduino_ports[0]
     return None
 
-def calculate_checksum(data):
-    """Calculate checksum for packet"""
-    checksum = 0
-    for byte in data:
-        checksum += byte
-    checksum = ~checksum & 0xFF
-    return checksum
+def enable_low_latency(connection):
+    """Ask the USB-serial driver to flush small packets immediately (Linux only)"""
+    try:
+        # Drops the FTDI-style 16ms latency timer to 1ms for short servo packets
+        connection.set_low_latency_mode(True)
+        print("⚡ Serial low-latency mode enabled")
+    except (AttributeError, NotImplementedError, ValueError, OSError):
+        # Not available on this platform/driver; on Linux the timer can also be set via
+        # /sys/bus/usb-serial/devices/<tty>/latency_timer
+        pass
+
+def build_servo_packet():
+    """Fill the reusable packet buffer with all current servo angles"""
+    # Packet: 0xAA 0x77 [Function] [Length] [Data...] [Checksum]; only data and checksum change
+    # Send all current servo angles (NO inversion here - let Arduino handle it)
+    SERVO_PACKET[4:10] = servo_angles
+    
+    # Checksum over function + length + all servo data; the header part is precomputed
+    SERVO_PACKET[10] = ~(_PREFIX_SUM + sum(servo_angles)) & 0xFF
+    return SERVO_PACKET
+
+def send_all_servo_angles():
+    """Send all current servo angles to Arduino in a single packet"""
+    if not serial_connection:
+        return False
+    
+    try:
+        serial_connection.write(build_servo_packet())
+        print(f"Sent: All angles: {servo_angles}")
+        return True
+        
+    except Exception as e:
+        print(f"Error sending command: {e}")
+        return False
 
 def send_servo_command(servo_id, angle):
     """Send servo command to Arduino"""
@@ -59,23 +98,8 @@ def send_servo_command(servo_id, angle):
         return False
     
     try:
-        # Build packet: 0xAA 0x77 [Function] [Length] [Data...] [Checksum]
-        packet = bytearray()
-        packet.append(CONST_STARTBYTE1)  # 0xAA
-        packet.append(CONST_STARTBYTE2)  # 0x77
-        packet.append(FUNC_SET_SERVO)    # Function code
-        packet.append(6)                 # Data length (6 servos)
-        
-        # Send all current servo angles (NO inversion here - let Arduino handle it)
-        packet.extend(servo_angles)
-        
-        # Calculate checksum (function + length + all servo data)
-        checksum_data = packet[2:]  # Everything after start bytes
-        checksum = calculate_checksum(checksum_data)
-        packet.append(checksum)
-        
-        # Send packet
-        serial_connection.write(packet)
+        # Every packet carries all six angles, so this just reports which servo changed
+        serial_connection.write(build_servo_packet())
         print(f"Sent: Servo {servo_id+1} = {angle}°, All angles: {servo_angles}")
         return True
         
@@ -83,31 +107,46 @@ def send_servo_command(servo_id, angle):
         print(f"Error sending command: {e}")
         return False
 
-def get_key():
-    """Get a single keypress without Enter"""
+def setup_cbreak():
+    """Put the terminal in cbreak mode for the whole session; returns (fd, settings to restore)"""
     fd = sys.stdin.fileno()
     old_settings = termios.tcgetattr(fd)
-    try:
-        tty.setcbreak(fd)
-        ch = sys.stdin.read(1)
-        
-        # Handle escape sequences (arrow keys)
-        if ch == '\x1b':  # ESC sequence
-            ch2 = sys.stdin.read(1)
-            if ch2 == '[':
-                ch3 = sys.stdin.read(1)
-                return f'\x1b[{ch3}'
-        return ch
-    finally:
-        termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+    tty.setcbreak(fd)
+    return fd, old_settings
+
+def get_key(fd, timeout=0.1):
+    """Wait up to timeout for a keypress (terminal already in cbreak mode); None if no key"""
+    ready, _, _ = select.select([fd], [], [], timeout)
+    if not ready:
+        return None
+    
+    # Read the fd directly: sys.stdin's buffer would hide pending bytes from select
+    ch = os.read(fd, 1).decode(errors="ignore")
+    
+    # Handle escape sequences (arrow keys)
+    if ch == '\x1b':  # ESC sequence
+        ch2 = os.read(fd, 1).decode(errors="ignore")
+        if ch2 == '[':
+            ch3 = os.read(fd, 1).decode(errors="ignore")
+            return f'\x1b[{ch3}'
+    return ch
 
 def print_status():
-    """Print current status"""
-    print("\033[2J\033[H")  # Clear screen and move to top
-    print("=" * 60)
-    print("           SIMPLE SERVO CONTROL")
-    print("=" * 60)
-    print()
+    """Print current status, repainting in place and only when it changed"""
+    global last_rendered
+    
+    state = (current_servo, tuple(servo_angles))
+    if state == last_rendered:
+        return
+    # Full clear only the first time; afterwards overwrite lines to avoid flicker
+    screen = "\033[2J" if last_rendered is None else ""
+    last_rendered = state
+    
+    lines = []
+    lines.append("=" * 60)
+    lines.append("           SIMPLE SERVO CONTROL")
+    lines.append("=" * 60)
+    lines.append("")
     
     # Show all servo angles
     for i in range(6):
@@ -122,20 +161,23 @@ def print_status():
             reset = ""
         
         # Show angle bar
-        bar_width = 30
-        angle_ratio = (servo_angles[i] - min_angle) / (max_angle - min_angle)
-        filled_width = int(angle_ratio * bar_width)
-        bar = "█" * filled_width + "░" * (bar_width - filled_width)
+        filled_width = int((servo_angles[i] - min_angle) * SERVO_INV_RANGES[i] * STATUS_BAR_WIDTH)
+        # An angle outside the servo's limits (e.g. the 90° start on the 0-82° thumb) gets a full or empty bar
+        bar = STATUS_BARS[min(max(filled_width, 0), STATUS_BAR_WIDTH)]
         
-        print(f"{marker}{color}Servo {i+1} ({servo_names[i]:>6}): {servo_angles[i]:3d}° [{bar}] ({min_angle}-{max_angle}°){reset}")
-    
-    print()
-    print("Controls:")
-    print("  ↑ / ↓     - Increase/Decrease angle")
-    print("  1-6       - Select servo")
-    print("  ESC       - Quit")
-    print()
-    print(f"Currently controlling: Servo {current_servo + 1} ({servo_names[current_servo]})")
+        lines.append(f"{marker}{color}{SERVO_LABELS[i]}{servo_angles[i]:3d}° [{bar}] ({min_angle}-{max_angle}°){reset}")
+    
+    lines.append("")
+    lines.append("Controls:")
+    lines.append("  ↑ / ↓     - Increase/Decrease angle")
+    lines.append("  1-6       - Select servo")
+    lines.append("  ESC       - Quit")
+    lines.append("")
+    lines.append(f"Currently controlling: Servo {current_servo + 1} ({servo_names[current_servo]})")
+    
+    # Home, each line cleared to its end, then clear anything left below
+    sys.stdout.write(screen + "\033[H" + "".join(f"{line}\033[K\n" for line in lines) + "\033[J")
+    sys.stdout.flush()
 
 def main():
     global current_servo, servo_angles, serial_connection
@@ -151,6 +193,7 @@ def main():
     
     try:
         serial_connection = serial.Serial(port, 115200, timeout=1)
+        enable_low_latency(serial_connection)
         time.sleep(2)  # Wait for Arduino to reset
         print(f"✅ Connected to Arduino on {port}")
     except Exception as e:
@@ -158,19 +201,24 @@ def main():
         return
     
     # Send initial position (all servos to default)
-    for i in range(6):
-        send_servo_command(i, servo_angles[i])
+    send_all_servo_angles()
     
     print("🎮 Starting control interface...")
     time.sleep(1)
     
+    # Keys are read unbuffered for the whole session; restored on exit
+    fd, old_settings = setup_cbreak()
+    
     try:
         while True:
             print_status()
             
-            key = get_key()
+            # Wake on a keypress, or periodically with nothing to do
+            key = get_key(fd)
             
-            if key == '\x1b':  # ESC key
+            if key is None:
+                continue
+            elif key == '\x1b':  # ESC key
                 print("\n👋 Exiting...")
                 break
             elif key == '\x1b[A':  # Up arrow
@@ -187,7 +235,7 @@ def main():
                     if servo_angles[current_servo] < min_angle:
                         servo_angles[current_servo] = min_angle
                     send_servo_command(current_servo, servo_angles[current_servo])
-            elif key in '123456':  # Number keys
+            elif len(key) == 1 and key in '123456':  # Number keys
                 servo_num = int(key) - 1
                 if 0 <= servo_num < 6:
                     current_servo = servo_num
@@ -195,17 +243,15 @@ def main():
                 print("\n👋 Exiting...")
                 break
             
-            time.sleep(0.05)  # Small delay
-            
     except KeyboardInterrupt:
         print("\n👋 Exiting...")
     
     finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
         if serial_connection:
             # Return all servos to neutral before closing
-            for i in range(6):
-                servo_angles[i] = 90
-                send_servo_command(i, 90)
+            servo_angles[:] = [90] * 6
+            send_all_servo_angles()
             time.sleep(0.5)
             serial_connection.close()
             print("🔌 Disconnected from Arduino")
@@ -8,6 +8,7 @@ ESC to quit
 """
 
 import asyncio
+import os
 import struct
 import sys
 import termios
@@ -22,46 +23,54 @@ HIWONDER_WRITE_CHAR_UUID = "0000ffe1-0000-1000-8000-00805f9b34fb"
 # Hiwonder protocol constants
 FRAME_HEADER = 0x55
 CMD_SERVO_MOVE = 0x03
+# Header x2, length, command, servo count, time (u16 LE), then (id, position u16 LE) per servo
+SERVO_PACKET_STRUCT = struct.Struct("<BBBBBH" + "BH" * 6)
+SERVO_PACKET_SIZE = SERVO_PACKET_STRUCT.size
 
 # Current state
 current_servo = 0  # 0-5 (servo 1-6)
 servo_angles = [90, 90, 90, 90, 90, 90]  # Default angles
 ble_client = None
 ble_write_char = None
+send_event = None  # asyncio.Event set when servo_angles has unsent changes
+last_sent_angles = [None] * 6  # Angles in the last packet that went out
+ble_write_slot = None  # asyncio.Semaphore(1): one unacknowledged write in flight at a time
+BLE_WRITE_INTERVAL = 0.015  # Seconds per write, about one BLE connection interval
 
 # Servo limits (0-180° for all servos in BLE mode)
 servo_limits = [(0, 180), (0, 180), (0, 180), (25, 180), (0, 180), (0, 180)]
 servo_names = ["Thumb", "Index", "Middle", "Ring", "Pinky", "Wrist"]
+last_rendered = None  # State shown by the last print_status call
+
+# Precomputed pieces of the status display
+STATUS_BAR_WIDTH = 30
+STATUS_BARS = ["█" * filled + "░" * (STATUS_BAR_WIDTH - filled) for filled in range(STATUS_BAR_WIDTH + 1)]
+SERVO_INV_RANGES = [1.0 / (max_angle - min_angle) for min_angle, max_angle in servo_limits]
+SERVO_LABELS = [f"Servo {i+1} ({name:>6}): " for i, name in enumerate(servo_names)]
+
+# Hiwonder position for every whole-degree angle 0-180
+ANGLE_TO_POSITION = tuple(int(1100 + (angle / 180.0) * (1950 - 1100)) for angle in range(181))
 
 def angle_to_position(angle):
     """Convert 0-180° angle to Hiwonder's 1100-1950 position range"""
-    return int(1100 + (angle / 180.0) * (1950 - 1100))
+    return ANGLE_TO_POSITION[angle]
 
 def build_hiwonder_servo_packet(servo_angles, time_ms=1000):
     """Build servo control packet using official Hiwonder protocol"""
-    servo_count = 6
-    
-    packet = bytearray()
-    packet.append(FRAME_HEADER)  # 0x55
-    packet.append(FRAME_HEADER)  # 0x55
-    packet.append(servo_count + 3)  # Number (length of remaining packet)
-    packet.append(CMD_SERVO_MOVE)  # Function
-    packet.append(servo_count)  # Number of servos
-    
-    # Time (2 bytes, little endian)
-    packet.append(time_ms & 0xFF)        # time_low
-    packet.append((time_ms >> 8) & 0xFF) # time_high
-    
-    # Servo data (3 bytes per servo: ID, pos_low, pos_high)
-    for i, angle in enumerate(servo_angles):
-        servo_id = i + 1  # Servo IDs are 1-based
-        position = angle_to_position(angle)
-        
-        packet.append(servo_id)
-        packet.append(position & 0xFF)        # pos_low
-        packet.append((position >> 8) & 0xFF) # pos_high
-    
-    return packet
+    # Servo data is (ID, position) per servo; IDs are 1-based
+    return SERVO_PACKET_STRUCT.pack(
+        FRAME_HEADER, FRAME_HEADER,  # 0x55 0x55
+        6 + 3,                       # Number (length of remaining packet)
+        CMD_SERVO_MOVE,              # Function
+        6,                           # Number of servos
+        time_ms,                     # Time (2 bytes, little endian)
+        1, ANGLE_TO_POSITION[servo_angles[0]],
+        2, ANGLE_TO_POSITION[servo_angles[1]],
+        3, ANGLE_TO_POSITION[servo_angles[2]],
+        4, ANGLE_TO_POSITION[servo_angles[3]],
+        5, ANGLE_TO_POSITION[servo_angles[4]],
+        6, ANGLE_TO_POSITION[servo_angles[5]],
+    )
 
 async def find_hiwonder_device():
     """Scan for Hiwonder BLE device using working logic from hand tracker"""
@@ -96,6 +105,22 @@ async def find_hiwonder_device():
         print(f"❌ BLE scan failed: {e}")
         return None
 
+async def negotiate_mtu():
+    """Ask for a larger ATT MTU so a servo packet goes out in a single PDU"""
+    # BlueZ only exchanges the MTU on request; CoreBluetooth negotiates it on connect
+    acquire_mtu = getattr(getattr(ble_client, "_backend", None), "_acquire_mtu", None)
+    if acquire_mtu:
+        try:
+            await acquire_mtu()
+        except Exception as e:
+            print(f"⚠️ MTU negotiation failed: {e}")
+    
+    mtu = ble_client.mtu_size
+    if mtu - 3 < SERVO_PACKET_SIZE:  # 3 bytes of ATT header per write
+        print(f"⚠️ BLE MTU {mtu}: {SERVO_PACKET_SIZE}-byte servo packets will be split")
+    else:
+        print(f"📏 BLE MTU {mtu}: servo packets fit in a single write")
+
 async def connect_ble():
     """Connect to Hiwonder BLE device using exact working logic from hand tracker"""
     global ble_client, ble_write_char
@@ -111,6 +136,7 @@ async def connect_ble():
         
         if ble_client.is_connected:
             print("🎉 SUCCESS! Connected to Hiwonder BLE device!")
+            await negotiate_mtu()
             
             # Verify services (exact same as hand tracker)
             services = ble_client.services
@@ -164,46 +190,80 @@ async def send_servo_command():
         # Build packet using official Hiwonder protocol (same as hand tracker)
         packet = build_hiwonder_servo_packet(servo_angles, time_ms=1000)
         
-        # Send via BLE using characteristic object (same method as hand tracker)
-        await ble_client.write_gatt_char(ble_write_char, packet, response=False)
+        # Send via BLE using characteristic object (same method as hand tracker);
+        # without acks, pace writes so they can't pile up in the BLE stack
+        async with ble_write_slot:
+            await ble_client.write_gatt_char(ble_write_char, packet, response=False)
+            await asyncio.sleep(BLE_WRITE_INTERVAL)
         return True
         
     except Exception as e:
         print(f"❌ BLE write failed: {e}")
         return False
 
-def get_key():
-    """Get a single keypress without Enter"""
+async def sender_loop():
+    """Send the latest servo angles whenever they change, collapsing key repeats"""
+    while True:
+        await send_event.wait()
+        await asyncio.sleep(0.01)  # Let adjacent key repeats land in the same packet
+        send_event.clear()
+        
+        # Up then Down inside one batch leaves nothing new to send
+        if servo_angles == last_sent_angles:
+            continue
+        if await send_servo_command():
+            last_sent_angles[:] = servo_angles
+            print(f"📤 Sent: {servo_angles}")
+
+def setup_cbreak():
+    """Put the terminal in cbreak mode for the whole session; returns (fd, settings to restore)"""
     fd = sys.stdin.fileno()
     old_settings = termios.tcgetattr(fd)
-    try:
-        tty.setcbreak(fd)
-        ch = sys.stdin.read(1)
-        
-        # Handle escape sequences (arrow keys)
-        if ch == '\x1b':  # ESC sequence
-            ch2 = sys.stdin.read(1)
-            if ch2 == '[':
-                ch3 = sys.stdin.read(1)
-                return f'\x1b[{ch3}'
-        return ch
-    finally:
-        termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+    tty.setcbreak(fd)
+    return fd, old_settings
+
+def get_key(fd):
+    """Get a single keypress without Enter (terminal already in cbreak mode)"""
+    # Read one byte at a time so keys typed together are each handled
+    ch = os.read(fd, 1).decode(errors="ignore")
+    
+    # Handle escape sequences (arrow keys)
+    if ch == '\x1b':  # ESC sequence
+        ch2 = os.read(fd, 1).decode(errors="ignore")
+        if ch2 == '[':
+            # Read through the final byte (@ to ~) so longer sequences like F5 (ESC [ 1 5 ~) don't leak digits
+            seq = ''
+            while True:
+                c = os.read(fd, 1).decode(errors="ignore")
+                seq += c
+                if not c or '@' <= c <= '~':
+                    break
+            return f'\x1b[{seq}'
+    return ch
 
 def print_status():
-    """Print current status"""
-    print("\033[2J\033[H")  # Clear screen and move to top
-    print("=" * 60)
-    print("       SIMPLE SERVO CONTROL - BLE VERSION")
-    print("=" * 60)
-    print()
+    """Print current status, repainting in place and only when it changed"""
+    global last_rendered
+    
+    state = (current_servo, tuple(servo_angles), ble_client is not None and ble_client.is_connected)
+    if state == last_rendered:
+        return
+    # Full clear only the first time; afterwards overwrite lines to avoid flicker
+    screen = "\033[2J" if last_rendered is None else ""
+    last_rendered = state
+    
+    lines = []
+    lines.append("=" * 60)
+    lines.append("       SIMPLE SERVO CONTROL - BLE VERSION")
+    lines.append("=" * 60)
+    lines.append("")
     
     # Show connection status
     if ble_client and ble_client.is_connected:
-        print("📡 BLE Status: 🟢 CONNECTED")
+        lines.append("📡 BLE Status: 🟢 CONNECTED")
     else:
-        print("📡 BLE Status: 🔴 DISCONNECTED")
-    print()
+        lines.append("📡 BLE Status: 🔴 DISCONNECTED")
+    lines.append("")
     
     # Show all servo angles
     for i in range(6):
@@ -218,46 +278,60 @@ def print_status():
             reset = ""
         
         # Show angle bar
-        bar_width = 30
-        angle_ratio = (servo_angles[i] - min_angle) / (max_angle - min_angle)
-        filled_width = int(angle_ratio * bar_width)
-        bar = "█" * filled_width + "░" * (bar_width - filled_width)
+        filled_width = int((servo_angles[i] - min_angle) * SERVO_INV_RANGES[i] * STATUS_BAR_WIDTH)
+        # An angle outside the servo's limits (e.g. the 90° start on the 0-82° thumb) gets a full or empty bar
+        bar = STATUS_BARS[min(max(filled_width, 0), STATUS_BAR_WIDTH)]
         
         # Show position value for debugging
         position = angle_to_position(servo_angles[i])
-        print(f"{marker}{color}Servo {i+1} ({servo_names[i]:>6}): {servo_angles[i]:3d}° [{bar}] ({min_angle}-{max_angle}°) pos={position}{reset}")
+        lines.append(f"{marker}{color}{SERVO_LABELS[i]}{servo_angles[i]:3d}° [{bar}] ({min_angle}-{max_angle}°) pos={position}{reset}")
     
-    print()
-    print("Controls:")
-    print("  ↑ / ↓     - Increase/Decrease angle")
-    print("  1-6       - Select servo")
-    print("  ESC       - Quit")
-    print()
-    print(f"Currently controlling: Servo {current_servo + 1} ({servo_names[current_servo]})")
+    lines.append("")
+    lines.append("Controls:")
+    lines.append("  ↑ / ↓     - Increase/Decrease angle")
+    lines.append("  1-6       - Select servo")
+    lines.append("  ESC       - Quit")
+    lines.append("")
+    lines.append(f"Currently controlling: Servo {current_servo + 1} ({servo_names[current_servo]})")
+    
+    # Home, each line cleared to its end, then clear anything left below
+    sys.stdout.write(screen + "\033[H" + "".join(f"{line}\033[K\n" for line in lines) + "\033[J")
+    sys.stdout.flush()
 
 async def main():
-    global current_servo, servo_angles, ble_client
+    global current_servo, servo_angles, ble_client, send_event, ble_write_slot
     
     print("Simple Servo Control (BLE) Starting...")
     
+    # Created inside the running loop, like send_event below
+    ble_write_slot = asyncio.Semaphore(1)
+    
     # Connect to BLE device
     if not await connect_ble():
         print("❌ Failed to connect to BLE device!")
         return
     
     # Send initial position (all servos to default)
-    await send_servo_command()
+    if await send_servo_command():
+        last_sent_angles[:] = servo_angles
     print(f"✅ Sent initial positions: {servo_angles}")
     
+    # Arrow keys only mark the angles dirty; this task does the BLE writes
+    send_event = asyncio.Event()
+    sender_task = asyncio.create_task(sender_loop())
+    
     print("🎮 Starting control interface...")
     await asyncio.sleep(1)
     
+    # Keys are read unbuffered for the whole session; restored on exit
+    fd, old_settings = setup_cbreak()
+    
     try:
         while True:
             print_status()
             
             # Get key input (blocking)
-            key = await asyncio.get_event_loop().run_in_executor(None, get_key)
+            key = await asyncio.get_event_loop().run_in_executor(None, get_key, fd)
             
             if key == '\x1b':  # ESC key
                 print("\n👋 Exiting...")
@@ -268,17 +342,15 @@ async def main():
                     servo_angles[current_servo] += 5
                     if servo_angles[current_servo] > max_angle:
                         servo_angles[current_servo] = max_angle
-                    await send_servo_command()
-                    print(f"📤 Sent: Servo {current_servo+1} = {servo_angles[current_servo]}°")
+                    send_event.set()
             elif key == '\x1b[B':  # Down arrow
                 min_angle, max_angle = servo_limits[current_servo]
                 if servo_angles[current_servo] > min_angle:
                     servo_angles[current_servo] -= 5
                     if servo_angles[current_servo] < min_angle:
                         servo_angles[current_servo] = min_angle
-                    await send_servo_command()
-                    print(f"📤 Sent: Servo {current_servo+1} = {servo_angles[current_servo]}°")
-            elif key in '123456':  # Number keys
+                    send_event.set()
+            elif len(key) == 1 and key in '123456':  # Number keys
                 servo_num = int(key) - 1
                 if 0 <= servo_num < 6:
                     current_servo = servo_num
@@ -292,6 +364,13 @@ async def main():
         print("\n👋 Exiting...")
     
     finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+        sender_task.cancel()
+        try:
+            await sender_task
+        except asyncio.CancelledError:
+            pass
+        
         if ble_client and ble_client.is_connected:
             # Return all servos to neutral before closing
             for i in range(6):
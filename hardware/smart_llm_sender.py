@@ -5,48 +5,329 @@ Integrates directly with the BLE pose sender's LLM mode.
 """
 
 import asyncio
-import subprocess
+import hashlib
 import json
-import re
+import threading
 import time
-from collections import deque
+from collections import OrderedDict
+from typing import NamedTuple
 import sys
 import os
+import numpy as np
+
+# BLE link to the hand (pip install bleak); without it angles are only printed
+try:
+    from ble_pose_sender import PoseSender
+    BLE_AVAILABLE = True
+except ImportError:
+    BLE_AVAILABLE = False
+
+# HTTP client for the LLM endpoint (pip install aiohttp); without it requests are skipped
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# Optional JIT compilation for the curl -> servo angle mapping
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when numba is not installed"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Faster JSON encoding/parsing for API requests and responses when orjson is installed
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+    
+    def _json_dumps(obj) -> bytes:
+        """Compact JSON encoding as bytes (orjson.dumps stand-in)"""
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+# Finger-curl parser, compiled once; google-re2 (linear-time matching) is used when installed
+try:
+    import re2 as _re
+except ImportError:
+    import re as _re
+# Inline (?i) rather than a flag: re2 takes no re-style flags
+_FINGER_RE = _re.compile(r'(?i)(pinky|ring|middle|index|thumb):\s*(no curl|half curl|full curl)')
+
+# Numeric codes for the plain "finger: curl; ..." fast path (same order/values as the regex path)
+_CURL_CODE = {'full curl': 0, 'half curl': 1, 'no curl': 2}
+_FINGER_IDX = {'pinky': 0, 'ring': 1, 'middle': 2, 'index': 3, 'thumb': 4}
+
+def _fast_parse_curls(text: str):
+    """Parse an exact 'pinky: no curl; ring: ...' line to a numeric array; None if it's anything else"""
+    numeric_array = [1, 1, 1, 1, 1]  # Missing fingers default to half curl
+    for part in text.split(';'):
+        if not part.strip():
+            continue  # Trailing separator
+        finger, _, curl = part.partition(':')
+        i = _FINGER_IDX.get(finger.strip().lower())
+        code = _CURL_CODE.get(curl.strip().lower())
+        if i is None or code is None:
+            return None
+        numeric_array[i] = code
+    return numeric_array
+
+# Servo angle per finger (rows in numeric array order: pinky, ring, middle, index, thumb)
+# and numeric curl value (columns: 0=full curl, 1=half curl, 2=no curl)
+_ANGLE_LUT = np.array([
+    [0, 90, 180],    # pinky
+    [25, 100, 180],  # ring
+    [0, 90, 180],    # middle
+    [0, 90, 180],    # index
+    [180, 90, 0],    # thumb
+], dtype=np.uint8)
+
+@njit(cache=True)
+def _map_numeric_to_angles(curls):
+    """Map 5 curl values (pinky..thumb) to 6 servo angles (thumb, index, middle, ring, pinky, wrist)"""
+    out = np.empty(6, dtype=np.int16)
+    for servo in range(5):
+        finger = 4 - servo  # Servo order is the reverse of the numeric array order
+        out[servo] = _ANGLE_LUT[finger, curls[finger]]
+    out[5] = 90  # Wrist
+    return out
+
+if NUMBA_AVAILABLE:
+    _map_numeric_to_angles(np.ones(5, dtype=np.int8))
+
+LLM_API_URL = "https://6kazu8ogvih4cs-8080.proxy.runpod.net/generate"
+# Prompt text is fixed apart from the four object fields filled in per request
+LLM_PROMPT_TEMPLATE = (
+    "Scene: A single everyday object is visible.\n"
+    "Object identity: {obj.object_identity}.\n"
+    "Object size: {obj.object_size}. Object position: {obj.object_position}. Object orientation: {obj.object_orientation}.\n"
+    "Task: Output only the finger curls in this exact format:\n"
+    "pinky: <no curl|half curl|full curl>; ring: <no curl|half curl|full curl>; middle: <no curl|half curl|full curl>; "
+    "index: <no curl|half curl|full curl>; thumb: <no curl|half curl|full curl>\n"
+    "Do not add any extra words."
+)
+LLM_JSON_HEADERS = {"Content-Type": "application/json"}
+# Generation settings sent with every prompt
+LLM_GENERATION_PARAMS = {
+    "max_new_tokens": 500,
+    "temperature": 1.5,
+    "top_p": 0.95,
+    "top_k": 50,
+    "do_sample": True,
+    "repetition_penalty": 1.0,
+    "stop": ["\n"]
+}
+
+# Response cache: repeated object descriptions skip the LLM round trip
+LLM_CACHE_SIZE = 256  # Responses kept (least recently used are evicted)
+LLM_CACHE_PATH = os.path.expanduser("~/.myogen_llm_cache.json")
+SEMANTIC_CACHE_MODEL = "all-MiniLM-L6-v2"  # sentence-transformers model for near-duplicate lookups
+SEMANTIC_CACHE_THRESHOLD = 0.92  # Cosine similarity needed to reuse a cached pose
+
+class ObjDesc(NamedTuple):
+    """One detected object waiting for (or sent to) the LLM (immutable, no per-instance dict)"""
+    object_identity: str
+    object_size: str
+    object_position: str
+    object_orientation: str
+    timestamp: float
 
 class SmartLLMSender:
-    def __init__(self):
-        self.pending_objects = deque()
+    def __init__(self, semantic_cache: bool = True):
+        # Created inside the running event loop (before Python 3.10 they bind to the loop current at creation)
+        self.pending_objects = None  # Only the newest object waits for the LLM
+        self.object_added = None  # Set by add_object when an object is queued
         self.is_processing = False
         self.latest_servo_angles = None
+        self.angles_version = 0  # Bumped whenever latest_servo_angles changes
+        self.sender = PoseSender() if BLE_AVAILABLE else None  # In-process BLE connection to the hand, opened by interactive_mode
+        
+        # Exact tier: prompt hash -> response, least recently used first
+        self._exact_cache = OrderedDict()
+        self._cache_dirty = False  # New responses not yet saved
+        # Semantic tier (optional, needs sentence-transformers + faiss); loaded on first use
+        self.semantic_cache = semantic_cache
+        self._embedder = None
+        self._semantic_index = None
+        self._semantic_angles = []  # Parsed servo angles, parallel to the rows of _semantic_index
+        self._embedder_lock = threading.Lock()  # Executor threads may load the model at the same time
+        
+        # One keep-alive HTTP session for all requests (created inside the running event loop)
+        self._session = None
+        
+        self.load_cache()  # Saved again by aclose()
+        
+    def _ensure_session(self) -> "aiohttp.ClientSession":
+        """Return the shared HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=4, ttl_dns_cache=300, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self._session
+    
+    def _ensure_queue(self) -> asyncio.Queue:
+        """Return the pending-object queue, creating it and object_added on first use"""
+        if self.pending_objects is None:
+            self.pending_objects = asyncio.Queue(maxsize=1)
+            self.object_added = asyncio.Event()
+        return self.pending_objects
+    
+    async def aclose(self):
+        """Save the response cache and close the HTTP session"""
+        self.save_cache()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
+    def load_cache(self):
+        """Load exact-match responses saved by a previous run"""
+        try:
+            with open(LLM_CACHE_PATH) as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not load LLM cache: {e}")
+            return
+        
+        for key, response in list(entries.items())[-LLM_CACHE_SIZE:]:
+            self._exact_cache[key] = response
+    
+    def save_cache(self):
+        """Save exact-match responses for the next run, merged with what's already on disk"""
+        if not self._cache_dirty:
+            return
+        # Other senders may have saved since this one loaded; keep their entries, ours are newer
+        try:
+            with open(LLM_CACHE_PATH) as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            entries = {}
+        for key, response in self._exact_cache.items():
+            entries.pop(key, None)
+            entries[key] = response
+        entries = dict(list(entries.items())[-LLM_CACHE_SIZE:])
+        
+        # Write a temp file and swap it in, so an interrupted save never leaves a truncated cache
+        tmp_path = f"{LLM_CACHE_PATH}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, LLM_CACHE_PATH)
+            self._cache_dirty = False
+        except OSError as e:
+            print(f"⚠️ Could not save LLM cache: {e}")
+    
+    def _embed_description(self, obj_desc: ObjDesc):
+        """L2-normalized embedding of the canonicalized object description, or None without the semantic tier"""
+        if self._embedder is None:
+            with self._embedder_lock:
+                if self._embedder is None:
+                    if not self.semantic_cache:
+                        return None
+                    try:
+                        import faiss
+                        from sentence_transformers import SentenceTransformer
+                    except ImportError:
+                        print("💡 Semantic cache disabled (pip install sentence-transformers faiss-cpu to enable)")
+                        self.semantic_cache = False
+                        return None
+                    embedder = SentenceTransformer(SEMANTIC_CACHE_MODEL)
+                    dim = embedder.get_sentence_embedding_dimension()
+                    self._semantic_index = faiss.IndexFlatIP(dim)
+                    self._embedder = embedder  # Published last: other threads check it without the lock
+        
+        # Case and spacing differences shouldn't make a description look new
+        text = " | ".join(" ".join(value.lower().split())
+                          for value in (obj_desc.object_identity, obj_desc.object_size,
+                                        obj_desc.object_position, obj_desc.object_orientation))
+        return self._embedder.encode([text], normalize_embeddings=True).astype(np.float32)
+    
+    def _lookup_cached_response(self, key: str):
+        """Return the cached response for this exact prompt, or None"""
+        response = self._exact_cache.get(key)
+        if response is not None:
+            self._exact_cache.move_to_end(key)
+            print("⚡ Cache hit (exact)")
+        return response
+    
+    def _store_response(self, key: str, response: str):
+        """Remember a fresh LLM response in the exact tier"""
+        self._exact_cache[key] = response
+        self._cache_dirty = True
+        if len(self._exact_cache) > LLM_CACHE_SIZE:
+            self._exact_cache.popitem(last=False)
+    
+    def _lookup_cached_angles(self, embedding):
+        """Return a copy of the servo angles stored for a near-identical description (semantic tier), or None"""
+        if embedding is None or not self._semantic_index.ntotal:
+            return None
+        scores, ids = self._semantic_index.search(embedding, 1)
+        if scores[0, 0] < SEMANTIC_CACHE_THRESHOLD:
+            return None
+        print(f"⚡ Cache hit (semantic, similarity {scores[0, 0]:.2f})")
+        return list(self._semantic_angles[ids[0, 0]])
+    
+    def _store_angles(self, embedding, servo_angles: list):
+        """Remember the angles for this description in the semantic tier, evicting the oldest entry"""
+        self._semantic_index.add(embedding)
+        self._semantic_angles.append(list(servo_angles))
+        if len(self._semantic_angles) > LLM_CACHE_SIZE:
+            # Oldest entry is row 0; later rows shift down to keep the lists parallel
+            self._semantic_index.remove_ids(np.array([0], dtype=np.int64))
+            self._semantic_angles.pop(0)
+    
+    def set_servo_angles(self, servo_angles: list):
+        """Publish new servo angles for the sender"""
+        self.latest_servo_angles = servo_angles
+        self.angles_version += 1
         
     def add_object(self, object_identity: str, object_size: str, object_position: str, object_orientation: str):
         """Add object description to processing queue"""
-        # Only keep the most recent object if queue is building up
-        if len(self.pending_objects) > 1:
-            old_obj = self.pending_objects.popleft()
-            print(f"⚠️ Replacing queued object: {old_obj['object_identity']} → {object_identity}")
+        obj_desc = ObjDesc(object_identity, object_size, object_position, object_orientation, time.time())
+        pending_objects = self._ensure_queue()
         
-        obj_desc = {
-            'object_identity': object_identity,
-            'object_size': object_size,
-            'object_position': object_position,
-            'object_orientation': object_orientation,
-            'timestamp': time.time()
-        }
+        # Only keep the most recent object: a newer one replaces the one still waiting
+        try:
+            old_obj = pending_objects.get_nowait()
+            pending_objects.task_done()
+            print(f"⚠️ Replacing queued object: {old_obj.object_identity} → {object_identity}")
+        except asyncio.QueueEmpty:
+            pass
         
-        self.pending_objects.append(obj_desc)
-        print(f"📝 Queued: {object_identity} (queue size: {len(self.pending_objects)})")
+        pending_objects.put_nowait(obj_desc)
+        self.object_added.set()
+        print(f"📝 Queued: {object_identity} (queue size: {pending_objects.qsize()})")
     
     async def process_next_object(self) -> bool:
         """Process the next object in queue, return True if processed"""
-        if not self.pending_objects or self.is_processing:
+        if self.is_processing or self.pending_objects is None or self.pending_objects.empty():
             return False
         
+        obj_desc = await self.pending_objects.get()
         self.is_processing = True
         
         try:
-            obj_desc = self.pending_objects.popleft()
-            print(f"\n🎯 Processing: {obj_desc['object_identity']}")
+            print(f"\n🎯 Processing: {obj_desc.object_identity}")
+            
+            # Embedding (and loading the model the first time) is CPU work, so it runs off the event loop
+            embedding = await asyncio.get_running_loop().run_in_executor(None, self._embed_description, obj_desc)
+            
+            # An object that was already answered (same or near-identical description) needs no LLM call
+            servo_angles = self._lookup_cached_angles(embedding)
+            if servo_angles is not None:
+                self.set_servo_angles(servo_angles)
+                print(f"⚡ Cached pose for {obj_desc.object_identity}: {servo_angles}")
+                return True
             
             # Make LLM request
             response = await self.make_llm_request(obj_desc)
@@ -54,61 +335,51 @@ class SmartLLMSender:
             if response:
                 # Parse and convert to servo angles
                 servo_angles = self.parse_to_servo_angles(response)
-                self.latest_servo_angles = servo_angles
+                self.set_servo_angles(servo_angles)
+                
+                # Later sightings of this object reuse the angles without an LLM request
+                if embedding is not None:
+                    self._store_angles(embedding, servo_angles)
                 
                 print(f"✅ Ready to send: {servo_angles}")
                 print(f"   [thumb={servo_angles[0]}°, index={servo_angles[1]}°, middle={servo_angles[2]}°, ring={servo_angles[3]}°, pinky={servo_angles[4]}°, wrist={servo_angles[5]}°]")
                 
                 return True
             else:
-                print(f"❌ No response for {obj_desc['object_identity']}")
+                print(f"❌ No response for {obj_desc.object_identity}")
                 return False
                 
         finally:
             self.is_processing = False
+            self.pending_objects.task_done()
     
-    async def make_llm_request(self, obj_desc: dict) -> str:
+    async def make_llm_request(self, obj_desc: ObjDesc) -> str:
         """Make async LLM API request"""
-        prompt = f"""Scene: A single everyday object is visible.
-Object identity: {obj_desc['object_identity']}.
-Object size: {obj_desc['object_size']}. Object position: {obj_desc['object_position']}. Object orientation: {obj_desc['object_orientation']}.
-Task: Output only the finger curls in this exact format:
-pinky: <no curl|half curl|full curl>; ring: <no curl|half curl|full curl>; middle: <no curl|half curl|full curl>; index: <no curl|half curl|full curl>; thumb: <no curl|half curl|full curl>
-Do not add any extra words."""
+        prompt = LLM_PROMPT_TEMPLATE.format(obj=obj_desc)
 
-        json_data = {
-            "prompt": prompt,
-            "max_new_tokens": 500,
-            "temperature": 1.5,
-            "top_p": 0.95,
-            "top_k": 50,
-            "do_sample": True,
-            "repetition_penalty": 1.0,
-            "stop": ["\n"]
-        }
+        key = hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest()
+        response = self._lookup_cached_response(key)
+        if response is not None:
+            return response
+
+        if not AIOHTTP_AVAILABLE:
+            print("❌ aiohttp not installed - run: pip install aiohttp")
+            return None
         
-        curl_script = f'''curl -sS -X POST "https://6kazu8ogvih4cs-8080.proxy.runpod.net/generate" \\
-  -H "Content-Type: application/json" \\
-  --data-binary @- << 'JSON'
-{json.dumps(json_data, indent=2)}
-JSON'''
+        body = _json_dumps({"prompt": prompt, **LLM_GENERATION_PARAMS})
         
         try:
-            # Run curl command asynchronously
-            process = await asyncio.create_subprocess_shell(
-                curl_script,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
+            session = self._ensure_session()
+            async with session.post(LLM_API_URL, data=body, headers=LLM_JSON_HEADERS) as resp:
+                text = await resp.text()
             
-            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=30)
-            
-            if process.returncode == 0:
-                response = stdout.decode().strip()
+            if resp.status == 200:
+                response = text.strip()
                 print(f"📤 API response: {response[:100]}...")
+                self._store_response(key, response)
                 return response
             else:
-                print(f"❌ API error: {stderr.decode()}")
+                print(f"❌ API error: HTTP {resp.status} {text[:200]}")
                 return None
                 
         except asyncio.TimeoutError:
@@ -121,23 +392,26 @@ JSON'''
     def parse_to_servo_angles(self, response: str) -> list:
         """Parse LLM response directly to servo angles"""
         # Parse finger curls
-        curl_to_numeric = {'full curl': 0, 'half curl': 1, 'no curl': 2}
         default_array = [1, 1, 1, 1, 1]
         
         try:
-            if response and response.strip().startswith('{'):
-                response_data = json.loads(response)
+            # Only parse JSON that can actually hold the text field; plain text goes straight to the regex
+            if response and response.lstrip()[:1] == '{' and ('"response"' in response or '"text"' in response):
+                response_data = _json_loads(response)
                 text = response_data.get('response', response_data.get('text', response))
             else:
                 text = response or ""
             
-            finger_pattern = r'(pinky|ring|middle|index|thumb):\s*(no curl|half curl|full curl)'
-            matches = re.findall(finger_pattern, text.lower())
+            # The prompt asks for exactly one "finger: curl; ..." line; the regex handles anything looser
+            numeric_array = _fast_parse_curls(text) if text.strip() else None
+            matches = _FINGER_RE.findall(text) if numeric_array is None else None
             
-            if matches:
-                finger_curls = {finger: curl for finger, curl in matches}
+            if numeric_array is not None:
+                print(f"🔄 Parsed: {numeric_array} [pinky, ring, middle, index, thumb]")
+            elif matches:
+                finger_curls = {finger.lower(): curl.lower() for finger, curl in matches}
                 finger_order = ['pinky', 'ring', 'middle', 'index', 'thumb']
-                numeric_array = [curl_to_numeric.get(finger_curls.get(finger, 'half curl'), 1) 
+                numeric_array = [_CURL_CODE.get(finger_curls.get(finger, 'half curl'), 1) 
                                for finger in finger_order]
                 print(f"🔄 Parsed: {numeric_array} [pinky, ring, middle, index, thumb]")
             else:
@@ -153,37 +427,12 @@ JSON'''
     
     def numeric_to_servo_angles(self, numeric_array: list) -> list:
         """Convert [0-2] numeric array to servo angles"""
-        numeric_to_curl = {0: "full curl", 1: "half curl", 2: "no curl"}
-        curl_states = [numeric_to_curl[val] for val in numeric_array]
-        
-        CURL_TO_ANGLE = {
-            'thumb': {'no curl': 0, 'half curl': 90, 'full curl': 180},
-            'index': {'no curl': 180, 'half curl': 90, 'full curl': 0},
-            'middle': {'no curl': 180, 'half curl': 90, 'full curl': 0},
-            'ring': {'no curl': 180, 'half curl': 100, 'full curl': 25},
-            'pinky': {'no curl': 180, 'half curl': 90, 'full curl': 0}
-        }
-        
-        finger_names = ['pinky', 'ring', 'middle', 'index', 'thumb']
-        finger_angles = {}
-        
-        for i, curl in enumerate(curl_states):
-            finger = finger_names[i]
-            finger_angles[finger] = CURL_TO_ANGLE[finger][curl]
-        
-        return [
-            finger_angles['thumb'],
-            finger_angles['index'], 
-            finger_angles['middle'],
-            finger_angles['ring'],
-            finger_angles['pinky'],
-            90  # wrist
-        ]
+        return _map_numeric_to_angles(np.asarray(numeric_array, dtype=np.int8)).tolist()
     
     def get_status(self) -> dict:
         """Get current processor status"""
         return {
-            'queue_size': len(self.pending_objects),
+            'queue_size': self.pending_objects.qsize() if self.pending_objects is not None else 0,
             'is_processing': self.is_processing,
             'latest_angles': self.latest_servo_angles
         }
@@ -198,79 +447,100 @@ async def interactive_mode():
     print("Commands:")
     print("  add <object_id> <size> <position> <orientation>")
     print("  process - Process next object in queue")
-    print("  send - Send latest angles to BLE pose sender")
+    print("  send - Send latest angles to the hand")
     print("  status - Show queue status")
     print("  auto - Start auto-processing mode")
     print("  quit - Exit")
     print("=" * 50)
     
+    # One BLE connection for the whole session instead of one per pose
+    print("\n🔗 Connecting to Hiwonder BLE device...")
+    sender = llm_processor.sender
+    if sender is None:
+        print("⚠️ bleak not installed - angles will only be printed")
+    elif not await sender.connect():
+        print("⚠️ No BLE connection - angles will only be printed")
+    
+    llm_processor._ensure_queue()  # auto mode waits on object_added
     auto_mode = False
+    sent_version = llm_processor.angles_version
     
-    while True:
-        try:
-            if auto_mode:
-                # Auto-process mode
-                processed = await llm_processor.process_next_object()
-                if processed and llm_processor.latest_servo_angles:
-                    # Auto-send to BLE pose sender
-                    angles = llm_processor.latest_servo_angles
-                    cmd = ['python3', 'ble_pose_sender.py', '--angles'] + [str(x) for x in angles]
-                    print(f"🚀 Auto-sending: {' '.join(cmd)}")
-                    # Uncomment to actually send:
-                    # subprocess.run(cmd)
+    try:
+        while True:
+            try:
+                if auto_mode:
+                    # Auto-process mode: sleep until add_object signals, no polling
+                    try:
+                        await asyncio.wait_for(llm_processor.object_added.wait(), timeout=5.0)
+                    except asyncio.TimeoutError:
+                        continue
+                    llm_processor.object_added.clear()
+                    await llm_processor.process_next_object()
+                    # New angles come from an LLM response or a pose cache hit
+                    if llm_processor.angles_version != sent_version and llm_processor.latest_servo_angles:
+                        sent_version = llm_processor.angles_version
+                        # Auto-send over the open BLE connection
+                        angles = llm_processor.latest_servo_angles
+                        if sender is not None and sender.is_connected:
+                            await sender.send(angles)
+                            print(f"🚀 Auto-sending: {angles}")
+                        else:
+                            print(f"⚠️ Not connected - angles: {angles}")
+                    continue
+                
+                command = input("\n> ").strip().lower()
+                
+                if command.startswith('add '):
+                    parts = command.split(' ', 4)
+                    if len(parts) >= 5:
+                        _, obj_id, size, position, orientation = parts
+                        llm_processor.add_object(obj_id, size, position, orientation)
+                    else:
+                        print("❌ Usage: add <object_id> <size> <position> <orientation>")
+                
+                elif command == 'process':
+                    processed = await llm_processor.process_next_object()
+                    if not processed:
+                        print("⚠️ Nothing to process or already processing")
+                
+                elif command == 'send':
+                    if llm_processor.latest_servo_angles:
+                        angles = llm_processor.latest_servo_angles
+                        if sender is None:
+                            print(f"⚠️ bleak not installed - angles: {angles}")
+                        elif await sender.send(angles):
+                            print(f"📤 Sent: {angles}")
+                    else:
+                        print("⚠️ No servo angles available")
+                
+                elif command == 'status':
+                    status = llm_processor.get_status()
+                    print(f"📊 Queue: {status['queue_size']}, Processing: {status['is_processing']}")
+                    if status['latest_angles']:
+                        print(f"   Latest: {status['latest_angles']}")
+                
+                elif command == 'auto':
+                    auto_mode = True
+                    print("🔄 Starting auto-processing mode... (Ctrl+C to stop)")
+                
+                elif command == 'quit':
+                    break
                 
-                await asyncio.sleep(1)  # Check every second
-                continue
-            
-            command = input("\n> ").strip().lower()
-            
-            if command.startswith('add '):
-                parts = command.split(' ', 4)
-                if len(parts) >= 5:
-                    _, obj_id, size, position, orientation = parts
-                    llm_processor.add_object(obj_id, size, position, orientation)
                 else:
-                    print("❌ Usage: add <object_id> <size> <position> <orientation>")
-            
-            elif command == 'process':
-                processed = await llm_processor.process_next_object()
-                if not processed:
-                    print("⚠️ Nothing to process or already processing")
-            
-            elif command == 'send':
-                if llm_processor.latest_servo_angles:
-                    angles = llm_processor.latest_servo_angles
-                    cmd = f"python3 ble_pose_sender.py --angles {' '.join(map(str, angles))}"
-                    print(f"📤 Command: {cmd}")
-                    # Uncomment to actually send:
-                    # subprocess.run(['python3', 'ble_pose_sender.py', '--angles'] + [str(x) for x in angles])
+                    print("❌ Unknown command")
+                    
+            except KeyboardInterrupt:
+                if auto_mode:
+                    auto_mode = False
+                    print("\n⏹️ Stopped auto-processing mode")
                 else:
-                    print("⚠️ No servo angles available")
-            
-            elif command == 'status':
-                status = llm_processor.get_status()
-                print(f"📊 Queue: {status['queue_size']}, Processing: {status['is_processing']}")
-                if status['latest_angles']:
-                    print(f"   Latest: {status['latest_angles']}")
-            
-            elif command == 'auto':
-                auto_mode = True
-                print("🔄 Starting auto-processing mode... (Ctrl+C to stop)")
-            
-            elif command == 'quit':
-                break
-            
-            else:
-                print("❌ Unknown command")
-                
-        except KeyboardInterrupt:
-            if auto_mode:
-                auto_mode = False
-                print("\n⏹️ Stopped auto-processing mode")
-            else:
-                break
-        except Exception as e:
-            print(f"❌ Error: {e}")
+                    break
+            except Exception as e:
+                print(f"❌ Error: {e}")
+    finally:
+        if sender is not None:
+            await sender.close()
+        await llm_processor.aclose()
 
 def main():
     """Main function"""
@@ -280,17 +550,20 @@ def main():
     print("waiting for each API response before processing the next.")
     print("=" * 50)
     
-    # Example usage
-    print("\n📝 Example: Adding keyboard object...")
-    llm_processor.add_object(
-        "080_keyboard", 
-        "medium", 
-        "several feet away, left, bottom relative to the camera",
-        "significantly rotated counterclockwise around the x-axis"
-    )
+    async def run():
+        # Queue the example inside the running loop, which owns the queue
+        print("\n📝 Example: Adding keyboard object...")
+        llm_processor.add_object(
+            "080_keyboard", 
+            "medium", 
+            "several feet away, left, bottom relative to the camera",
+            "significantly rotated counterclockwise around the x-axis"
+        )
+        
+        # Run interactive mode
+        await interactive_mode()
     
-    # Run interactive mode
-    asyncio.run(interactive_mode())
+    asyncio.run(run())
 
 if __name__ == "__main__":
     main()
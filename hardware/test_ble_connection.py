@@ -5,11 +5,10 @@ Simple script to test and verify BLE connectivity
 """
 
 import asyncio
-from bleak import BleakScanner, BleakClient
+from bleak import BleakScanner
+from ble_common import get_hiwonder_client, is_hiwonder
 
 # Hiwonder device constants
-HIWONDER_DEVICE_NAME = "Hiwonder"
-HIWONDER_MAC = "8EE2E4F9-42E6-5BE3-4E2A-A706CAD38879"
 HIWONDER_SERVICE_UUID = "0000fff0-0000-1000-8000-00805f9b34fb"
 HIWONDER_WRITE_CHAR_UUID = "0000ffe1-0000-1000-8000-00805f9b34fb"
 
@@ -22,15 +21,13 @@ async def scan_for_devices():
         
         hiwonder_found = False
         for i, device in enumerate(devices):
-            is_hiwonder = (device.name == HIWONDER_DEVICE_NAME or 
-                          device.address == HIWONDER_MAC or 
-                          (device.name and "hiwonder" in device.name.lower()))
+            matched = is_hiwonder(device)
             
-            status = "🎯 HIWONDER!" if is_hiwonder else "  "
+            status = "🎯 HIWONDER!" if matched else "  "
             rssi = getattr(device, 'rssi', 'N/A')
             print(f"{status} {i+1:2d}. {device.name or 'Unknown':<20} {device.address} RSSI: {rssi}dBm")
             
-            if is_hiwonder:
+            if matched:
                 hiwonder_found = True
         
         return hiwonder_found
@@ -44,12 +41,10 @@ async def test_connection():
     print("🔗 Testing connection to Hiwonder BLE device...")
     
     try:
-        # Try to connect using MAC address
-        print(f"📞 Attempting connection to {HIWONDER_MAC}...")
-        client = BleakClient(HIWONDER_MAC)
-        await client.connect()
+        # Cached address from a previous run first; scans only if that fails
+        client = await get_hiwonder_client()
         
-        if client.is_connected:
+        if client:
             print("🎉 SUCCESS! Connected to Hiwonder BLE device!")
             
             # List services
@@ -57,20 +52,19 @@ async def test_connection():
             service_list = list(services)
             print(f"📋 Found {len(service_list)} services:")
             
-            target_service = None
-            target_char = None
+            # Direct UUID lookups; only a characteristic inside the target service counts
+            target_service = services.get_service(HIWONDER_SERVICE_UUID)
+            target_char = target_service.get_characteristic(HIWONDER_WRITE_CHAR_UUID) if target_service else None
             
             for service in services:
                 print(f"   Service: {service.uuid}")
-                if service.uuid.lower() == HIWONDER_SERVICE_UUID.lower():
-                    target_service = service
+                if service is target_service:
                     print("   🎯 TARGET SERVICE FOUND!")
                 
                 for char in service.characteristics:
                     props = ", ".join(char.properties)
                     print(f"      Char: {char.uuid} [{props}]")
-                    if char.uuid.lower() == HIWONDER_WRITE_CHAR_UUID.lower():
-                        target_char = char
+                    if char is target_char:
                         print("      🎯 TARGET CHARACTERISTIC FOUND!")
             
             if target_service and target_char:
@@ -102,25 +96,23 @@ async def main():
     print("🤖 Hiwonder BLE Connection Test")
     print("=" * 40)
     
-    # First scan for devices
-    found = await scan_for_devices()
+    # Connect straight away; the full device scan is only needed to diagnose a failure
+    success = await test_connection()
     
     print("\n" + "=" * 40)
     
-    if found:
-        print("✅ Hiwonder device detected in scan!")
-        print("🔗 Attempting connection test...")
-        success = await test_connection()
-        
-        if success:
-            print("\n🎉 BLE CONNECTION TEST PASSED!")
-            print("💡 Your Hiwonder device is ready for hand tracking!")
-        else:
-            print("\n❌ BLE CONNECTION TEST FAILED!")
-            print("💡 Check if device is in pairing/connection mode")
+    if success:
+        print("\n🎉 BLE CONNECTION TEST PASSED!")
+        print("💡 Your Hiwonder device is ready for hand tracking!")
     else:
-        print("❌ Hiwonder device not found in scan")
-        print("💡 Make sure device is powered on and in discoverable mode")
+        print("\n❌ BLE CONNECTION TEST FAILED!")
+        found = await scan_for_devices()
+        if found:
+            print("✅ Hiwonder device detected in scan!")
+            print("💡 Check if device is in pairing/connection mode")
+        else:
+            print("❌ Hiwonder device not found in scan")
+            print("💡 Make sure device is powered on and in discoverable mode")
     
     print("\n👋 Test complete")
 
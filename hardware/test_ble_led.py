@@ -7,53 +7,65 @@ Press keys to send commands and test BLE communication in real-time.
 """
 
 import asyncio
+import os
 import sys
-import select
 import tty
 import termios
-from bleak import BleakScanner, BleakClient
+from ble_common import get_hiwonder_client
 
 # Hiwonder BLE Constants
-HIWONDER_DEVICE_NAME = "Hiwonder"
 HIWONDER_SERVICE_UUID = "0000fff0-0000-1000-8000-00805f9b34fb"
 HIWONDER_WRITE_CHAR_UUID = "0000ffe1-0000-1000-8000-00805f9b34fb"
 
 # Global variables for BLE
 client = None
 write_char = None
+write_limit = 20  # Bytes per write (ATT MTU - 3); updated from the negotiated MTU after connecting
+WRITE_COALESCE_DELAY = 0.001  # Commands queued within this window go out as one write
+pending_writes = bytearray()  # Command bytes waiting for the next write
+pending_descriptions = []
+flush_task = None
 
-async def scan_for_hiwonder():
-    """Scan for Hiwonder BLE device"""
-    print("🔍 Scanning for Hiwonder BLE device...")
+async def flush_commands():
+    """Send all queued command bytes in a single write-without-response"""
+    global flush_task
     
-    devices = await BleakScanner.discover(timeout=10)
-    
-    for device in devices:
-        if device.name == HIWONDER_DEVICE_NAME:
-            print(f"✓ Found Hiwonder device: {device.address}")
-            return device
-    
-    print("❌ Hiwonder device not found!")
-    return None
-
-def get_key():
-    """Get a single keypress from stdin (non-blocking)"""
-    if select.select([sys.stdin], [], [], 0) == ([sys.stdin], [], []):
-        return sys.stdin.read(1)
-    return None
-
-async def send_command(cmd_byte, description):
-    """Send a single command to the Arduino"""
-    global client, write_char
+    data = bytes(pending_writes)
+    descriptions = ", ".join(pending_descriptions)
+    pending_writes.clear()
+    pending_descriptions.clear()
+    flush_task = None
     
     try:
-        await client.write_gatt_char(write_char, bytes([cmd_byte]))
-        print(f"✓ Sent: {description} (0x{cmd_byte:02X})")
+        # No ACK round trip per write; the Arduino reads the bytes as a stream either way
+        await client.write_gatt_char(write_char, data, response=False)
+        print(f"✓ Sent: {descriptions} ({data.hex(' ').upper()})")
         return True
     except Exception as e:
-        print(f"❌ Failed to send {description}: {e}")
+        print(f"❌ Failed to send {descriptions}: {e}")
         return False
 
+async def delayed_flush():
+    """Flush once the coalescing window has passed"""
+    await asyncio.sleep(WRITE_COALESCE_DELAY)
+    await flush_commands()
+
+async def send_command(cmd_byte, description):
+    """Queue a single command to the Arduino; commands close together share one BLE write"""
+    global flush_task
+    
+    if len(pending_writes) + 1 > write_limit:
+        # Would overflow one packet: send what's queued first
+        if flush_task:
+            flush_task.cancel()
+        await flush_commands()
+    
+    pending_writes.append(cmd_byte)
+    pending_descriptions.append(description)
+    if flush_task is None:
+        flush_task = asyncio.create_task(delayed_flush())
+    return True
+
 async def interactive_control():
     """Interactive keyboard control loop"""
     print("\n🎮 Interactive LED Control")
@@ -68,15 +80,22 @@ async def interactive_control():
     print("Press keys to control the LED...")
     print()
     
+    # The event loop calls back when stdin is readable; keys are handled in order as they arrive
+    loop = asyncio.get_running_loop()
+    fd = sys.stdin.fileno()
+    keys = asyncio.Queue()
+    
+    def on_stdin():
+        keys.put_nowait(os.read(fd, 1).decode(errors="ignore"))
+    
     # Set terminal to raw mode for immediate key detection
     old_settings = termios.tcgetattr(sys.stdin)
     try:
-        tty.setraw(sys.stdin.fileno())
+        tty.setraw(fd)
+        loop.add_reader(fd, on_stdin)
         
         while True:
-            await asyncio.sleep(0.1)  # Small delay to prevent busy waiting
-            
-            key = get_key()
+            key = await keys.get()
             if key:
                 if key == 'q' or key == '\x03':  # 'q' or Ctrl+C
                     print("\n👋 Quitting...")
@@ -93,58 +112,62 @@ async def interactive_control():
                     print(f"Unknown key: '{key}' - use 1/0/b/s/q")
     
     finally:
+        loop.remove_reader(fd)
+        # Send anything still queued before the connection closes
+        if flush_task:
+            await flush_task
         # Restore terminal settings
         termios.tcsetattr(sys.stdin, termios.TCSADRAIN, old_settings)
 
 async def main():
     """Main BLE LED test function"""
-    global client, write_char
+    global client, write_char, write_limit
     
     print("=== Interactive BLE LED Control ===")
     print("Manual keyboard control of Arduino LED via BLE")
     print()
     
-    # Scan for device
-    device = await scan_for_hiwonder()
-    if not device:
+    # Cached address first, scan only if needed
+    client = await get_hiwonder_client()  # Set global for other functions
+    if not client:
         print("\nTroubleshooting:")
         print("• Make sure the Hiwonder BLE module is powered on")
         print("• Check that the module is not connected to another device")
         print("• Try moving closer to the module")
         return
     
-    print(f"\n🔗 Connecting to {device.address}...")
-    
     try:
-        async with BleakClient(device) as ble_client:
-            client = ble_client  # Set global for other functions
-            print("✓ Connected!")
-            
-            # Find our service and characteristic
-            services = client.services
-            target_char = None
-            
-            for service in services:
-                if service.uuid.lower() == HIWONDER_SERVICE_UUID.lower():
-                    print("✓ Found target service!")
-                    
-                    for char in service.characteristics:
-                        if char.uuid.lower() == HIWONDER_WRITE_CHAR_UUID.lower():
-                            target_char = char
-                            write_char = char  # Set global for other functions
-                            print("✓ Found write characteristic!")
-                            break
-                    break
-            
-            if not target_char:
-                print("❌ Could not find write characteristic!")
-                return
-            
-            # Start interactive control
-            await interactive_control()
-            
+        print("✓ Connected!")
+        
+        # Find our service and characteristic
+        services = client.services
+        target_char = None
+        
+        for service in services:
+            if service.uuid.lower() == HIWONDER_SERVICE_UUID.lower():
+                print("✓ Found target service!")
+                
+                for char in service.characteristics:
+                    if char.uuid.lower() == HIWONDER_WRITE_CHAR_UUID.lower():
+                        target_char = char
+                        write_char = char  # Set global for other functions
+                        print("✓ Found write characteristic!")
+                        break
+                break
+        
+        if not target_char:
+            print("❌ Could not find write characteristic!")
+            return
+        
+        write_limit = client.mtu_size - 3
+        
+        # Start interactive control
+        await interactive_control()
+        
     except Exception as e:
         print(f"❌ Connection error: {e}")
+    finally:
+        await client.disconnect()
 
 if __name__ == "__main__":
     try:
@@ -7,67 +7,57 @@ Uses the correct protocol format from the official Hiwonder code:
 """
 
 import asyncio
-from bleak import BleakScanner, BleakClient
+import struct
+import numpy as np
+from ble_common import get_hiwonder_client
 
 # Hiwonder BLE Constants
-HIWONDER_DEVICE_NAME = "Hiwonder"
 HIWONDER_SERVICE_UUID = "0000fff0-0000-1000-8000-00805f9b34fb"
 HIWONDER_WRITE_CHAR_UUID = "0000ffe1-0000-1000-8000-00805f9b34fb"
 
 # Official Protocol Constants
 FRAME_HEADER = 0x55
 CMD_SERVO_MOVE = 0x03
+SERVO_HEADER = struct.Struct("<BBBBBH")  # header x2, number, function, servo count, time
+SERVO_ENTRY = np.dtype([('id', 'u1'), ('position', '<u2')])  # Packed 3-byte servo record
+
+# Map 0-180 to 1100-1950, precomputed for every whole-degree angle
+ANGLE_TO_POSITION = np.array([int(1100 + (angle / 180.0) * (1950 - 1100)) for angle in range(181)], dtype=np.uint16)
 
 def angle_to_position(angle):
     """Convert 0-180 angle to Hiwonder servo position (1100-1950)"""
-    # Map 0-180 to 1100-1950
-    return int(1100 + (angle / 180.0) * (1950 - 1100))
+    return int(ANGLE_TO_POSITION[int(angle)])
+
+# One packet buffer reused by every build, sized for the largest servo count;
+# servo IDs (1-N) never change, so they're filled in once
+MAX_SERVOS = 8
+_PKT_BUF = bytearray(SERVO_HEADER.size + MAX_SERVOS * SERVO_ENTRY.itemsize)
+_PKT_VIEW = memoryview(_PKT_BUF)
+_PKT_SERVOS = np.frombuffer(_PKT_BUF, SERVO_ENTRY, offset=SERVO_HEADER.size)
+_PKT_SERVOS['id'] = np.arange(1, MAX_SERVOS + 1)
 
 def build_official_servo_packet(servo_angles, time_ms=1000):
     """Build servo control packet using official Hiwonder protocol"""
-    packet = bytearray()
-    
-    # Frame header (2 bytes)
-    packet.append(FRAME_HEADER)  # 0x55
-    packet.append(FRAME_HEADER)  # 0x55
-    
-    # Calculate number of bytes (function + servo_count + time + servo_data)
     servo_count = len(servo_angles)
-    data_bytes = 1 + 1 + 2 + (servo_count * 3)  # func + count + time + (id+pos_low+pos_high)*6
-    packet.append(data_bytes)  # Number
-    
-    # Function
-    packet.append(CMD_SERVO_MOVE)  # 0x03
-    
-    # Servo count
-    packet.append(servo_count)  # 6 servos
-    
-    # Time (little endian)
-    packet.append(time_ms & 0xFF)        # time_low
-    packet.append((time_ms >> 8) & 0xFF) # time_high
+    if servo_count > MAX_SERVOS:
+        raise ValueError(f"At most {MAX_SERVOS} servos per packet, got {servo_count}")
     
-    # Servo data
-    for i, angle in enumerate(servo_angles):
-        position = angle_to_position(angle)
-        packet.append(i + 1)                    # Servo ID (1-6)
-        packet.append(position & 0xFF)          # position_low
-        packet.append((position >> 8) & 0xFF)   # position_high
+    # Header: 0x55 0x55, number of bytes (func + count + time + (id+pos_low+pos_high)*N),
+    # function, servo count, time (little endian)
+    data_bytes = 1 + 1 + 2 + (servo_count * 3)
+    SERVO_HEADER.pack_into(_PKT_BUF, 0, FRAME_HEADER, FRAME_HEADER, data_bytes,
+                           CMD_SERVO_MOVE, servo_count, time_ms & 0xFFFF)
     
-    return packet
-
-async def scan_for_hiwonder():
-    """Scan for Hiwonder BLE device"""
-    print("🔍 Scanning for Hiwonder BLE device...")
-    
-    devices = await BleakScanner.discover(timeout=10)
+    # Table lookups only cover 0-180; a negative index would silently wrap to the other end
+    angles = np.asarray(servo_angles, dtype=np.intp)
+    if servo_count and (angles.min() < 0 or angles.max() > 180):
+        raise ValueError(f"Servo angles must be 0-180, got {list(servo_angles)}")
     
-    for device in devices:
-        if device.name == HIWONDER_DEVICE_NAME:
-            print(f"✓ Found Hiwonder device: {device.address}")
-            return device
+    # Servo positions, written for all servos at once through the view into the buffer
+    _PKT_SERVOS['position'][:servo_count] = ANGLE_TO_POSITION[angles]
     
-    print("❌ Hiwonder device not found!")
-    return None
+    # Copy out the used part so later builds can't change a packet that's still being sent
+    return bytes(_PKT_VIEW[:SERVO_HEADER.size + servo_count * SERVO_ENTRY.itemsize])
 
 async def test_official_protocol():
     """Test with official Hiwonder protocol"""
@@ -75,63 +65,56 @@ async def test_official_protocol():
     print("Using the correct protocol format from official code")
     print()
     
-    # Scan for device
-    device = await scan_for_hiwonder()
-    if not device:
+    # Cached address first, scan only if needed; only the Hiwonder service is discovered
+    client = await get_hiwonder_client(services=[HIWONDER_SERVICE_UUID])
+    if not client:
         return
     
-    print(f"\n🔗 Connecting to {device.address}...")
-    
     try:
-        async with BleakClient(device) as client:
-            print("✓ Connected!")
-            
-            # Find our service and characteristic
-            services = client.services
-            target_char = None
-            
-            for service in services:
-                if service.uuid.lower() == HIWONDER_SERVICE_UUID.lower():
-                    for char in service.characteristics:
-                        if char.uuid.lower() == HIWONDER_WRITE_CHAR_UUID.lower():
-                            target_char = char
-                            break
-                    break
-            
-            if not target_char:
-                print("❌ Could not find write characteristic!")
-                return
-            
-            # Test poses
-            test_poses = [
-                ([90, 90, 90, 90, 90, 90], "Neutral position"),
-                ([0, 0, 0, 25, 0, 0], "Open hand"),
-                ([82, 180, 180, 180, 180, 180], "Closed fist"),
-                ([0, 0, 180, 180, 180, 180], "Pointing"),
-            ]
+        print("✓ Connected!")
+        
+        # Find our service and characteristic (direct UUID lookups)
+        service = client.services.get_service(HIWONDER_SERVICE_UUID)
+        target_char = service.get_characteristic(HIWONDER_WRITE_CHAR_UUID) if service else None
+        
+        if not target_char:
+            print("❌ Could not find write characteristic!")
+            return
+        
+        # Test poses
+        test_poses = [
+            ([90, 90, 90, 90, 90, 90], "Neutral position"),
+            ([0, 0, 0, 25, 0, 0], "Open hand"),
+            ([82, 180, 180, 180, 180, 180], "Closed fist"),
+            ([0, 0, 180, 180, 180, 180], "Pointing"),
+        ]
+        
+        for angles, description in test_poses:
+            print(f"\n📤 Testing: {description}")
+            print(f"   Angles: {angles}")
             
-            for angles, description in test_poses:
-                print(f"\n📤 Testing: {description}")
-                print(f"   Angles: {angles}")
-                
-                # Build packet with official protocol
-                packet = build_official_servo_packet(angles, time_ms=1000)
-                
-                print(f"   Packet: {' '.join(f'0x{b:02X}' for b in packet)}")
-                print(f"   Length: {len(packet)} bytes")
-                
-                try:
-                    await client.write_gatt_char(target_char, packet)
-                    print("   ✓ Sent successfully")
-                    await asyncio.sleep(2)  # Wait to see movement
-                except Exception as e:
-                    print(f"   ❌ Send failed: {e}")
+            # Build packet with official protocol
+            packet = build_official_servo_packet(angles, time_ms=1000)
             
-            print(f"\n🎉 Official protocol test complete!")
-            print(f"📋 Check if servos moved correctly with each pose")
+            print(f"   Packet: {' '.join(f'0x{b:02X}' for b in packet)}")
+            print(f"   Length: {len(packet)} bytes")
             
+            # Each pose is held for 2 s to watch it, so there is nothing to coalesce;
+            # write without response rather than waiting for a write acknowledgement
+            try:
+                await client.write_gatt_char(target_char, packet, response=False)
+                print("   ✓ Sent successfully")
+                await asyncio.sleep(2)  # Wait to see movement
+            except Exception as e:
+                print(f"   ❌ Send failed: {e}")
+        
+        print(f"\n🎉 Official protocol test complete!")
+        print(f"📋 Check if servos moved correctly with each pose")
+        
     except Exception as e:
         print(f"❌ Connection error: {e}")
+    finally:
+        await client.disconnect()
 
 if __name__ == "__main__":
     try:
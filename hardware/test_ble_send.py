@@ -80,6 +80,9 @@ def build_servo_packet(angles):
     
     return bytes(packet)
 
+# Test poses are fixed, so their packets are built once at import
+TEST_PACKETS = {pose["name"]: build_servo_packet(pose["angles"]) for pose in TEST_POSES}
+
 async def send_test_data(client, write_char):
     """Send all test poses to the Arduino"""
     print("\n🚀 Starting BLE test sequence...")
@@ -91,8 +94,8 @@ async def send_test_data(client, write_char):
         print(f"   Description: {pose['description']}")
         print(f"   Angles: {pose['angles']}")
         
-        # Build and send packet
-        packet = build_servo_packet(pose['angles'])
+        # Send the prebuilt packet
+        packet = TEST_PACKETS[pose['name']]
         print(f"   Packet: {' '.join(f'0x{b:02X}' for b in packet)}")
         
         try: